@@ -1,15 +1,120 @@
+import importlib.util
+import json
+import os
 import random
-from typing import Dict, Any
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
 
+import config as cfg
 
-AI_LEVELS = ("Easy", "Medium", "Hard")
-AI_SPEED_FACTORS = {
-    "Easy": 0.45,
-    "Medium": 0.75,
-    "Hard": 1.35,
+
+AIM_FOLLOW = "follow"        # chase the ball's current y
+AIM_LEAD = "lead"            # lead the ball by up to lead_frames of its vertical motion
+AIM_INTERCEPT = "intercept"  # predict where the ball crosses the paddle, wall bounces included
+AIM_LEARNED = "learned"      # trained policy from the weights file (see learned.py; needs NumPy)
+AIMS = (AIM_FOLLOW, AIM_LEAD, AIM_INTERCEPT, AIM_LEARNED)
+
+
+@dataclass(frozen=True, slots=True)
+class AIProfile:
+    """Immutable tuning of one AI difficulty level."""
+    name: str
+    speed_factor: float              # paddle speed relative to a human player
+    react_frames: int                # delay before reacting to a ball turning towards the paddle
+    jitter: int                      # max random aim error in pixels, drawn once per trajectory
+    track_only_when_approaching: bool
+    aim: str = AIM_FOLLOW
+    lead_frames: float = 0.6
+    dead_zone: float = 6.0           # no movement while the target is this close to the paddle centre
+    weights: Optional[str] = None    # learned aim: weights file, relative to this package
+
+    def max_step(self, paddle_speed: int) -> int:
+        return max(1, int(paddle_speed * self.speed_factor))
+
+
+DEFAULT_PROFILES = {
+    "Easy": AIProfile("Easy", 0.40, 8, 70, True, AIM_FOLLOW),
+    "Medium": AIProfile("Medium", 0.65, 4, 30, True, AIM_LEAD),
+    "Hard": AIProfile("Hard", 1.15, 1, 6, False, AIM_INTERCEPT),
 }
 
 
+def profiles_from_json(text: str, source: str = "<string>") -> Dict[str, AIProfile]:
+    """Parse {level name: profile fields}, keeping the level order."""
+    profiles = {}
+    for name, fields in json.loads(text).items():
+        profile = AIProfile(name=name, **fields)
+        if profile.aim not in AIMS:
+            raise ValueError(f"{source}: {name}: unknown aim {profile.aim!r}")
+        profiles[name] = profile
+    if not profiles:
+        raise ValueError(f"{source}: no AI profiles")
+    return profiles
+
+
+def profiles_to_json(profiles: Dict[str, AIProfile]) -> str:
+    return json.dumps({name: {k: v for k, v in asdict(p).items() if k != "name"} for name, p in profiles.items()})
+
+
+def load_profiles(path: str) -> Dict[str, AIProfile]:
+    with open(path, "r", encoding="utf-8") as fh:
+        return profiles_from_json(fh.read(), path)
+
+
+def _default_profiles() -> Dict[str, AIProfile]:
+    if not (cfg.AI_PROFILES_PATH and os.path.exists(cfg.AI_PROFILES_PATH)):
+        return dict(DEFAULT_PROFILES)
+    profiles = load_profiles(cfg.AI_PROFILES_PATH)
+    if importlib.util.find_spec("numpy") is None:
+        # Learned levels need NumPy; offer only the scripted ones without it
+        profiles = {name: p for name, p in profiles.items() if p.aim != AIM_LEARNED}
+    return profiles
+
+
+PROFILES = _default_profiles()
+AI_LEVELS = tuple(PROFILES)
+
+
+class AIState:
+    """Per-match state of one AI paddle, bound to a profile resolved at match start."""
+    __slots__ = ("profile", "max_step", "window_width", "policy", "cooldown", "last_seen_velx", "epoch_vx", "epoch_vy", "offset", "intercept")
+
+    def __init__(self, profile: AIProfile, paddle_speed: int, window_width: int = cfg.WINDOW_WIDTH) -> None:
+        self.profile = profile
+        self.max_step = profile.max_step(paddle_speed)
+        self.window_width = window_width
+        self.policy = load_policy(profile) if profile.aim == AIM_LEARNED else None
+        self.reset()
+
+    def reset(self) -> None:
+        self.cooldown = 0
+        self.last_seen_velx = 0.0
+        self.epoch_vx: Optional[float] = None
+        self.epoch_vy: Optional[float] = None
+        self.offset = 0
+        self.intercept = 0.0
+
+    def save(self) -> tuple:
+        return (self.cooldown, self.last_seen_velx, self.epoch_vx, self.epoch_vy, self.offset, self.intercept)
+
+    def load(self, saved: tuple) -> None:
+        self.cooldown, self.last_seen_velx, self.epoch_vx, self.epoch_vy, self.offset, self.intercept = saved
+
+
+def load_policy(profile: AIProfile) -> Any:
+    from learned import get_policy
+    path = profile.weights or cfg.LEARNED_AI_WEIGHTS
+    return get_policy(path if os.path.isabs(path) else os.path.join(os.path.dirname(os.path.abspath(__file__)), path))
+
+
+def _move_learned(paddle: Any, ball: Any, state: AIState, window_height: int) -> None:
+    action = state.policy.decide(paddle, ball, state.window_width, window_height)
+    if action == 1:
+        paddle.y = max(0, paddle.y - state.max_step)
+    elif action == 2:
+        paddle.y = min(window_height - paddle.height, paddle.y + state.max_step)
+
+
 def _predict_ball_y_at_x(ball: Any, target_x: float, window_height: int) -> float:
     if ball.vel_x <= 0:
         return ball.y
@@ -28,62 +133,54 @@ def _predict_ball_y_at_x(ball: Any, target_x: float, window_height: int) -> floa
     return mirrored + ball.radius
 
 
-def move_ai_paddle(right_paddle: Any, ball: Any, difficulty: str, ai_state: Dict[str, float], paddle_speed: int, window_height: int) -> None:
-    factor = AI_SPEED_FACTORS.get(difficulty, 0.9)
-    max_step = max(1, int(paddle_speed * factor))
-
-    if 'cooldown' not in ai_state:
-        ai_state['cooldown'] = 0
-    if 'last_seen_velx' not in ai_state:
-        ai_state['last_seen_velx'] = 0.0
-
-    if difficulty == "Easy":
-        react_frames = 8
-        jitter = 70
-        track_only_when_approaching = True
-    elif difficulty == "Medium":
-        react_frames = 4
-        jitter = 30
-        track_only_when_approaching = True
-    else:
-        react_frames = 1
-        jitter = 6
-        track_only_when_approaching = False
-
-    approaching = ball.vel_x > 0
-    if approaching and ai_state.get('last_seen_velx', 0.0) <= 0:
-        ai_state['cooldown'] = react_frames
-    ai_state['last_seen_velx'] = ball.vel_x
+def move_ai_paddle(right_paddle: Any, ball: Any, state: AIState, window_height: int, rng: Any = random) -> None:
+    profile = state.profile
+    vel_x, vel_y = ball.vel_x, ball.vel_y
+    approaching = vel_x > 0
+    if approaching and state.last_seen_velx <= 0:
+        state.cooldown = profile.react_frames
+    state.last_seen_velx = vel_x
 
-    if ai_state['cooldown'] > 0:
-        ai_state['cooldown'] -= 1
+    if state.cooldown > 0:
+        state.cooldown -= 1
         return
 
-    if difficulty == "Hard":
-        target_x = right_paddle.x - right_paddle.width // 2
-        target_y = _predict_ball_y_at_x(ball, target_x, window_height)
-        target_y += random.randint(-jitter, jitter)
-    elif difficulty == "Medium":
-        if ball.vel_x > 0:
-            t = (right_paddle.x - ball.x) / max(1e-5, ball.vel_x)
-            target_y = ball.y + ball.vel_y * min(t, 0.6)
-        else:
-            target_y = ball.y
-        target_y += random.randint(-jitter, jitter)
-    else:
-        target_y = ball.y + random.randint(-jitter, jitter)
+    if state.policy is not None:
+        _move_learned(right_paddle, ball, state, window_height)
+        return
 
-    if track_only_when_approaching and not approaching:
+    if profile.track_only_when_approaching and not approaching:
         center_target = window_height / 2
+        drift = state.max_step // 2
         if right_paddle.center_y < center_target - 8:
-            right_paddle.y = min(window_height - right_paddle.height, right_paddle.y + max_step // 2)
+            right_paddle.y = min(window_height - right_paddle.height, right_paddle.y + drift)
         elif right_paddle.center_y > center_target + 8:
-            right_paddle.y = max(0, right_paddle.y - max_step // 2)
+            right_paddle.y = max(0, right_paddle.y - drift)
         return
 
-    if right_paddle.center_y < target_y - 6:
-        right_paddle.y = min(window_height - right_paddle.height, right_paddle.y + max_step)
-    elif right_paddle.center_y > target_y + 6:
-        right_paddle.y = max(0, right_paddle.y - max_step)
+    # Hits, wall bounces, launches and speedups all change the velocity, so it
+    # identifies the trajectory epoch: jitter and the intercept are drawn
+    # once per epoch and held until the next one
+    if state.epoch_vx != vel_x or state.epoch_vy != vel_y:
+        state.epoch_vx = vel_x
+        state.epoch_vy = vel_y
+        state.offset = rng.randint(-profile.jitter, profile.jitter)
+        if profile.aim == AIM_INTERCEPT and approaching:
+            target_x = right_paddle.x - right_paddle.width // 2
+            state.intercept = _predict_ball_y_at_x(ball, target_x, window_height) + state.offset
 
+    aim = profile.aim
+    if aim == AIM_INTERCEPT and approaching:
+        target_y = state.intercept
+    elif aim == AIM_LEAD and approaching:
+        t = (right_paddle.x - ball.x) / max(1e-5, vel_x)
+        target_y = ball.y + vel_y * min(t, profile.lead_frames) + state.offset
+    else:
+        target_y = ball.y + state.offset
 
+    # Nothing to do while the target is within the dead zone
+    center_y = right_paddle.center_y
+    if center_y < target_y - profile.dead_zone:
+        right_paddle.y = min(window_height - right_paddle.height, right_paddle.y + state.max_step)
+    elif center_y > target_y + profile.dead_zone:
+        right_paddle.y = max(0, right_paddle.y - state.max_step)
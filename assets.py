@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import pygame
+
+
+ASSET_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Decoded images as loaded from disk, display-format copies, and sounds; failed
+# loads are cached as None so they are not retried on every menu visit.
+_raw_images: dict = {}
+_converted: dict = {}
+_scaled: dict = {}  # (name, alpha) -> (scale, resized copy)
+_sounds: dict = {}
+_load_times: dict[str, float] = {}
+_pending: dict[str, threading.Event] = {}
+_lock = threading.Lock()
+
+
+def asset_path(name: str) -> str:
+    """Resolve an asset name such as "assets/pong_hit.wav" relative to the package."""
+    return name if os.path.isabs(name) else os.path.join(ASSET_ROOT, name)
+
+
+def _cached_load(cache: dict, name: str, loader):
+    """Load name once; concurrent callers wait for the first load instead of repeating it."""
+    with _lock:
+        if name in cache:
+            return cache[name]
+        pending = _pending.get(name)
+        owner = pending is None
+        if owner:
+            pending = _pending[name] = threading.Event()
+    if not owner:
+        pending.wait()
+        return cache[name]
+
+    start = time.perf_counter()
+    try:
+        value = loader(asset_path(name))
+    except Exception:
+        value = None
+    with _lock:
+        _load_times[name] = time.perf_counter() - start
+        cache[name] = value
+        del _pending[name]
+    pending.set()
+    return value
+
+
+def load_image(name: str, alpha: bool = False) -> pygame.Surface | None:
+    """Image from the cache, converted to the display format once a display mode is set."""
+    surface = _cached_load(_raw_images, name, pygame.image.load)
+    if surface is None or pygame.display.get_surface() is None:
+        return surface
+    key = (name, alpha)
+    converted = _converted.get(key)
+    if converted is None:
+        converted = surface.convert_alpha() if alpha else surface.convert()
+        _converted[key] = converted
+    return converted
+
+
+def load_image_scaled(name: str, scale: float, alpha: bool = False) -> pygame.Surface | None:
+    """load_image() resized by scale; the resized copy is reused until a different scale is asked for."""
+    surface = load_image(name, alpha)
+    if surface is None or scale == 1.0:
+        return surface
+    key = (name, alpha)
+    cached = _scaled.get(key)
+    if cached is None or cached[0] != scale:
+        cached = _scaled[key] = (scale, pygame.transform.smoothscale_by(surface, scale))
+    return cached[1]
+
+
+def load_sound(name: str) -> pygame.mixer.Sound | None:
+    """Sound from the cache; the mixer must already be initialized."""
+    return _cached_load(_sounds, name, pygame.mixer.Sound)
+
+
+def preload(images=(), sounds=(), background: bool = False) -> threading.Thread | None:
+    """Decode the given assets ahead of use, optionally on a daemon thread."""
+    def run() -> None:
+        for name in images:
+            _cached_load(_raw_images, name, pygame.image.load)
+        for name in sounds:
+            load_sound(name)
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="asset-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def load_times() -> dict[str, float]:
+    """Seconds spent loading each asset name so far."""
+    with _lock:
+        return dict(_load_times)
+
+
+def report() -> str:
+    times = load_times()
+    lines = [f"{name:32s} {secs * 1000:8.2f} ms" for name, secs in sorted(times.items(), key=lambda item: -item[1])]
+    lines.append(f"{'total':32s} {sum(times.values()) * 1000:8.2f} ms")
+    return "\n".join(lines)
@@ -1,27 +1,138 @@
+import queue
+import sys
+import threading
+import time
+import traceback
+
 import pygame
 
+import assets
+import config as cfg
+
+
+SOUND_ASSETS = (cfg.SND_HIT_WAV, cfg.SND_SCORE_WAV, cfg.SND_WIN_WAV)
+
+# Game event -> (voice group, sound asset)
+EVENT_SOUNDS = {
+    "launch": ("paddle", cfg.SND_HIT_WAV),
+    "hit": ("paddle", cfg.SND_HIT_WAV),
+    "wall": ("paddle", cfg.SND_WALL_WAV),
+    "score": ("score", cfg.SND_SCORE_WAV),
+    "win": ("win", cfg.SND_WIN_WAV),
+}
+
 
-def init_audio() -> tuple[pygame.mixer.Sound | None, pygame.mixer.Sound | None, pygame.mixer.Sound | None]:
+def init_audio(buffer: int = cfg.AUDIO_BUFFER) -> tuple[pygame.mixer.Sound | None, pygame.mixer.Sound | None, pygame.mixer.Sound | None]:
     """Initialize mixer and load external WAV sound effects from assets/ folder.
 
     Returns (paddle_sound, score_sound, victory_sound); any may be None if loading fails.
     """
     if not pygame.mixer.get_init():
-        pygame.mixer.init(frequency=44100, size=-16, channels=1, buffer=512)
-
-    try:
-        snd_paddle = pygame.mixer.Sound("assets/pong_hit.wav")
-    except Exception:
-        snd_paddle = None
-    try:
-        snd_score = pygame.mixer.Sound("assets/pong_score.wav")
-    except Exception:
-        snd_score = None
-    try:
-        snd_victory = pygame.mixer.Sound("assets/pong_win.wav")
-    except Exception:
-        snd_victory = None
+        pygame.mixer.init(frequency=44100, size=-16, channels=1, buffer=buffer)
+
+    snd_paddle = assets.load_sound(cfg.SND_HIT_WAV)
+    snd_score = assets.load_sound(cfg.SND_SCORE_WAV)
+    snd_victory = assets.load_sound(cfg.SND_WIN_WAV)
 
     return snd_paddle, snd_score, snd_victory
 
 
+class AudioDispatcher:
+    """Plays game events on reserved mixer channels from a background thread.
+
+    start() opens the mixer and decodes the sounds off the main thread; post()
+    only enqueues, so the simulation never calls into the mixer. Each voice
+    group owns a fixed set of channels (cfg.AUDIO_VOICES); events arriving while
+    all of a group's channels are busy are dropped, as are events older than
+    cfg.AUDIO_MAX_DELAY_MS (e.g. posted before the mixer was ready).
+
+    If the mixer cannot be opened or the thread fails, the reason is printed
+    to stderr, kept in self.error, and later post() calls are ignored.
+    """
+
+    def __init__(self, buffer: int = cfg.AUDIO_BUFFER) -> None:
+        self.buffer = buffer
+        self.ready = threading.Event()
+        self.dropped = 0
+        self.error: BaseException | None = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._sounds: dict = {}
+        self._channels: dict[str, list] = {}
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def post(self, events) -> None:
+        """Queue the events raised by one simulation tick."""
+        if events and self.error is None:
+            self._queue.put((time.perf_counter(), tuple(events)))
+
+    def _open(self) -> None:
+        init_audio(self.buffer)
+        # Channels must exist before they are handed out
+        total = sum(cfg.AUDIO_VOICES.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for group, voices in cfg.AUDIO_VOICES.items():
+            self._channels[group] = [pygame.mixer.Channel(first + i) for i in range(voices)]
+            first += voices
+        for event, (group, name) in EVENT_SOUNDS.items():
+            self._sounds[event] = assets.load_sound(name) if name else None
+
+    def _play(self, event: str) -> None:
+        sound = self._sounds.get(event)
+        if sound is None:
+            return
+        group = EVENT_SOUNDS[event][0]
+        for channel in self._channels[group]:
+            if not channel.get_busy():
+                channel.play(sound)
+                return
+        self.dropped += 1
+
+    def _run(self) -> None:
+        try:
+            self._open()
+        except pygame.error as exc:
+            # No audio device, or the mixer refused the format: play silently
+            self.error = exc
+            print(f"audio disabled: {exc}", file=sys.stderr)
+            return
+        except Exception as exc:
+            self.error = exc
+            print("audio thread failed to start:", file=sys.stderr)
+            traceback.print_exc()
+            return
+        self.ready.set()
+        try:
+            self._dispatch()
+        except Exception as exc:
+            self.error = exc
+            print("audio thread stopped:", file=sys.stderr)
+            traceback.print_exc()
+
+    def _dispatch(self) -> None:
+        max_delay = cfg.AUDIO_MAX_DELAY_MS / 1000.0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            posted, events = item
+            if time.perf_counter() - posted > max_delay:
+                self.dropped += len(events)
+                continue
+            for event in events:
+                # Only play the score sound if the round continues (not on the winning point)
+                if event == "score" and "win" in events:
+                    continue
+                self._play(event)
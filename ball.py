@@ -1,8 +1,13 @@
 import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
 
 
 class Ball:
     """Represents the game ball with movement and collision state."""
+    __slots__ = ("x", "y", "radius", "vel_x", "vel_y", "_rect")
 
     def __init__(self, x: float, y: float, radius: int, vel_x: float, vel_y: float) -> None:
         self.x = x
@@ -10,6 +15,22 @@ class Ball:
         self.radius = radius
         self.vel_x = vel_x
         self.vel_y = vel_y
+        self._rect = None
+
+    @property
+    def rect(self) -> "pygame.Rect":
+        """Bounding box (int-truncated), one object for the ball's lifetime, synced on access.
+
+        Only drawing code needs it, so pygame is imported on first use and the
+        simulation itself runs without it.
+        """
+        rect = self._rect
+        if rect is None:
+            from pygame import Rect
+            rect = self._rect = Rect(0, 0, self.radius * 2, self.radius * 2)
+        rect.x = int(self.x - self.radius)
+        rect.y = int(self.y - self.radius)
+        return rect
 
     def move(self) -> None:
         self.x += self.vel_x
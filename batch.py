@@ -0,0 +1,297 @@
+import argparse
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+import config as cfg
+from ai import AIM_INTERCEPT, AIM_LEAD, AIM_LEARNED, AIProfile, PROFILES, load_policy
+from engine import AI_LAUNCH_DELAY_MS, PADDLE_MARGIN
+
+
+ACTION_STAY = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+
+
+class _AIArrays:
+    """Per-match ai_state of one side (see ai.move_ai_paddle)."""
+
+    def __init__(self, n: int) -> None:
+        self.cooldown = np.zeros(n, dtype=np.int64)
+        self.last_vx = np.zeros(n)
+        self.epoch_vx = np.full(n, np.nan)
+        self.epoch_vy = np.full(n, np.nan)
+        self.offset = np.zeros(n)
+        self.intercept = np.zeros(n)
+
+    def reset(self, mask: np.ndarray) -> None:
+        self.cooldown[mask] = 0
+        self.last_vx[mask] = 0.0
+        self.epoch_vx[mask] = np.nan
+        self.epoch_vy[mask] = np.nan
+
+
+class BatchPong:
+    """Vectorized simulator advancing n independent matches per step().
+
+    The left paddle is driven by the actions passed to step() unless left_ai is
+    set; the right paddle is driven by right_ai. Both sides auto-launch after
+    AI_LAUNCH_DELAY_MS once they hold the ball. Finished matches are reset in
+    place, so step() can be called indefinitely.
+
+    Observations are float32 rows of (ball_x, ball_y, ball_vel_x, ball_vel_y,
+    left_paddle_y, right_paddle_y); rewards are +1/-1 per point from the left
+    player's point of view.
+    """
+
+    def __init__(self, n: int, left_ai: Optional[str] = None, right_ai: Optional[str] = "Medium",
+                 seed: Optional[int] = None, width: int = cfg.WINDOW_WIDTH, height: int = cfg.WINDOW_HEIGHT,
+                 profiles: Optional[dict] = None) -> None:
+        profiles = profiles or PROFILES
+        self.n = n
+        self.width = width
+        self.height = height
+        self.left_ai = profiles[left_ai] if left_ai else None
+        self.right_ai = profiles[right_ai] if right_ai else None
+        self.left_step = self.left_ai.max_step(cfg.PADDLE_SPEED) if left_ai else 0
+        self.right_step = self.right_ai.max_step(cfg.PADDLE_SPEED) if right_ai else 0
+        self.dt_ms = 1000.0 / cfg.TICK_RATE
+        self.radius = cfg.BALL_RADIUS
+        self.pw = cfg.PADDLE_WIDTH
+        self.ph = cfg.PADDLE_HEIGHT
+        self.left_x = PADDLE_MARGIN
+        self.right_x = width - PADDLE_MARGIN - cfg.PADDLE_WIDTH
+        self.max_angle = math.radians(cfg.MAX_BOUNCE_ANGLE_DEG)
+        self.rng = np.random.default_rng(seed)
+
+        self.bx = np.zeros(n)
+        self.by = np.zeros(n)
+        self.vx = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.speed = np.zeros(n)
+        self.hits = np.zeros(n, dtype=np.int64)
+        self.ly = np.zeros(n)
+        self.ry = np.zeros(n)
+        self.lscore = np.zeros(n, dtype=np.int64)
+        self.rscore = np.zeros(n, dtype=np.int64)
+        self.held = np.zeros(n, dtype=np.int8)  # 0 free, 1 left, 2 right
+        self.launch_ms = np.zeros(n)
+        self.l_ai = _AIArrays(n)
+        self.r_ai = _AIArrays(n)
+        self.frames = 0
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_matches(np.ones(self.n, dtype=bool))
+        return self._obs()
+
+    def _reset_matches(self, mask: np.ndarray) -> None:
+        self.lscore[mask] = 0
+        self.rscore[mask] = 0
+        self.ly[mask] = self.height // 2 - self.ph // 2
+        self.ry[mask] = self.height // 2 - self.ph // 2
+        self.l_ai.reset(mask)
+        self.r_ai.reset(mask)
+        side = self.rng.integers(1, 3, size=self.n).astype(np.int8)
+        self._give_possession(mask, np.where(mask, side, 0))
+
+    def _give_possession(self, mask: np.ndarray, side: np.ndarray) -> None:
+        self.held = np.where(mask, side, self.held).astype(np.int8)
+        self.vx[mask] = 0.0
+        self.vy[mask] = 0.0
+        self.speed[mask] = cfg.BALL_SPEED
+        self.hits[mask] = 0
+        self.launch_ms[mask] = AI_LAUNCH_DELAY_MS
+
+    def _obs(self) -> np.ndarray:
+        return np.stack((self.bx, self.by, self.vx, self.vy, self.ly, self.ry), axis=1).astype(np.float32)
+
+    def _ai_move(self, profile: AIProfile, max_step: int, py: np.ndarray, x: np.ndarray, vx: np.ndarray,
+                 ai: _AIArrays, active: np.ndarray) -> np.ndarray:
+        """Vectorized ai.move_ai_paddle, expressed in the right paddle's frame."""
+        react, jitter, track_only = profile.react_frames, profile.jitter, profile.track_only_when_approaching
+        h, r = self.height, self.radius
+        y, vy = self.by, self.vy
+        approaching = vx > 0
+        ai.cooldown[:] = np.where(active & approaching & (ai.last_vx <= 0), react, ai.cooldown)
+        ai.last_vx[:] = np.where(active, vx, ai.last_vx)
+        waiting = active & (ai.cooldown > 0)
+        ai.cooldown -= waiting
+        moving = active & ~waiting
+
+        if profile.aim == AIM_LEARNED:
+            center = py + self.ph / 2
+            x_feat = np.stack(((self.right_x - x) / self.width, y / h - 0.5, vx / cfg.MAX_BALL_SPEED,
+                               vy / cfg.MAX_BALL_SPEED, center / h - 0.5, (y - center) / h), axis=1)
+            action = load_policy(profile).act_batch(x_feat.astype(np.float32))
+            new_py = np.where(action == ACTION_UP, np.maximum(0, py - max_step),
+                              np.where(action == ACTION_DOWN, np.minimum(h - self.ph, py + max_step), py))
+            return np.where(moving, new_py, py)
+
+        # New trajectory epoch (velocity changed): redraw jitter and, on Hard,
+        # the intercept, only for the matches concerned
+        new_epoch = moving & ((vx != ai.epoch_vx) | (vy != ai.epoch_vy))
+        if new_epoch.any():
+            idx = np.flatnonzero(new_epoch)
+            ai.epoch_vx[idx] = vx[idx]
+            ai.epoch_vy[idx] = vy[idx]
+            ai.offset[idx] = self.rng.integers(-jitter, jitter + 1, size=idx.size)
+            if profile.aim == AIM_INTERCEPT:
+                target_x = self.right_x - self.pw // 2
+                sx, sy = x[idx], y[idx]
+                svx = np.where(vx[idx] > 0, vx[idx], 1.0)
+                t = (target_x - sx) / svx
+                projected = sy + vy[idx] * t
+                period = 2 * (h - r)
+                m = np.mod(projected - r, period)
+                mirrored = np.where(m > h - r, period - m, m) + r
+                ai.intercept[idx] = np.where((vx[idx] > 0) & (t > 0), mirrored, sy) + ai.offset[idx]
+
+        if profile.aim == AIM_INTERCEPT:
+            target = np.where(approaching, ai.intercept, y + ai.offset)
+        elif profile.aim == AIM_LEAD:
+            t = (self.right_x - x) / np.maximum(1e-5, vx)
+            target = np.where(approaching, y + vy * np.minimum(t, profile.lead_frames), y) + ai.offset
+        else:
+            target = y + ai.offset
+
+        center = py + self.ph / 2
+        down = center < target - profile.dead_zone
+        up = center > target + profile.dead_zone
+        new_py = np.where(down, np.minimum(h - self.ph, py + max_step), np.where(up, np.maximum(0, py - max_step), py))
+        if track_only:
+            drift = max_step // 2
+            mid = h / 2
+            drift_py = np.where(center < mid - 8, np.minimum(h - self.ph, py + drift),
+                                np.where(center > mid + 8, np.maximum(0, py - drift), py))
+            new_py = np.where(approaching, new_py, drift_py)
+        return np.where(moving, new_py, py)
+
+    def _paddle_hit(self, py: np.ndarray, px: int) -> np.ndarray:
+        # Same test as physics.ball_intersects_paddle (circle vs paddle rect)
+        dx = np.maximum(np.maximum(px - self.bx, self.bx - (px + self.pw)), 0.0)
+        dy = np.maximum(np.maximum(py - self.by, self.by - (py + self.ph)), 0.0)
+        return dx * dx + dy * dy < self.radius * self.radius
+
+    def _bounce(self, mask: np.ndarray, py: np.ndarray, direction: float) -> None:
+        normalized = np.clip((self.by - (py + self.ph / 2)) / (self.ph / 2), -1.0, 1.0)
+        angle = normalized * self.max_angle
+        self.vx = np.where(mask, direction * self.speed * np.cos(angle), self.vx)
+        self.vy = np.where(mask, self.speed * np.sin(angle), self.vy)
+
+    def step(self, actions: Optional[np.ndarray] = None):
+        """Advance every match by one frame; returns (obs, rewards, dones, info)."""
+        self.frames += self.n
+        free = self.held == 0
+        h, r, w = self.height, self.radius, self.width
+
+        # Paddles
+        if self.left_ai:
+            self.ly = self._ai_move(self.left_ai, self.left_step, self.ly, w - self.bx, -self.vx,
+                                    self.l_ai, free)
+        elif actions is not None:
+            ps = cfg.PADDLE_SPEED
+            self.ly = np.where(actions == ACTION_UP, np.maximum(0, self.ly - ps),
+                               np.where(actions == ACTION_DOWN, np.minimum(h - self.ph, self.ly + ps), self.ly))
+        if self.right_ai:
+            self.ry = self._ai_move(self.right_ai, self.right_step, self.ry, self.bx, self.vx,
+                                    self.r_ai, free)
+
+        # Free balls: swept paddle faces (as physics.handle_collision), walls, then
+        # the discrete overlap fallback; at most one paddle contact per tick
+        x0, y0 = self.bx, self.by
+        face_l = self.left_x + self.pw + r
+        face_r = self.right_x - r
+        t_l = (face_l - x0) / np.where(self.vx < 0, self.vx, -1.0)
+        t_r = (face_r - x0) / np.where(self.vx > 0, self.vx, 1.0)
+        y_l = y0 + self.vy * t_l
+        y_r = y0 + self.vy * t_r
+        sweep_l = free & (self.vx < 0) & (x0 >= face_l) & (t_l <= 1.0) & (y_l >= self.ly - r) & (y_l <= self.ly + self.ph + r)
+        sweep_r = free & (self.vx > 0) & (x0 <= face_r) & (t_r <= 1.0) & (y_r >= self.ry - r) & (y_r <= self.ry + self.ph + r)
+        t = np.where(sweep_l, t_l, np.where(sweep_r, t_r, 1.0))
+        self.bx = np.where(free, x0 + self.vx * t, x0)
+        self.by = np.where(free, y0 + self.vy * t, y0)
+        self._bounce(sweep_l, self.ly, 1.0)
+        self._bounce(sweep_r, self.ry, -1.0)
+        swept = sweep_l | sweep_r
+        self.bx = np.where(swept, self.bx + self.vx * (1.0 - t), self.bx)
+        self.by = np.where(swept, self.by + self.vy * (1.0 - t), self.by)
+
+        top = free & (self.by - r <= 0)
+        bottom = free & ~top & (self.by + r >= h)
+        self.by = np.where(top, 2 * r - self.by, np.where(bottom, 2 * (h - r) - self.by, self.by))
+        self.vy = np.where(top, np.abs(self.vy), np.where(bottom, -np.abs(self.vy), self.vy))
+
+        hit_left = free & ~swept & (self.vx < 0) & self._paddle_hit(self.ly, self.left_x)
+        hit_right = free & ~swept & ~hit_left & (self.vx > 0) & self._paddle_hit(self.ry, self.right_x)
+        self._bounce(hit_left, self.ly, 1.0)
+        self._bounce(hit_right, self.ry, -1.0)
+        self.bx = np.where(hit_left, face_l, np.where(hit_right, face_r, self.bx))
+        hit_left |= sweep_l
+        hit_right |= sweep_r
+        hit = hit_left | hit_right
+        self.hits += hit
+        speedup = hit & (self.hits % cfg.HITS_PER_SPEEDUP == 0)
+        if speedup.any():
+            new_speed = np.minimum(cfg.MAX_BALL_SPEED, self.speed + cfg.SPEED_INCREMENT)
+            mag = np.hypot(self.vx, self.vy)
+            scale = np.where(speedup & (mag > 0), new_speed / np.where(mag > 0, mag, 1.0), 1.0)
+            self.speed = np.where(speedup, new_speed, self.speed)
+            self.vx *= scale
+            self.vy *= scale
+
+        # Held balls: attach to holder and auto-launch
+        held_l = self.held == 1
+        held_r = self.held == 2
+        self.bx = np.where(held_l, self.left_x + self.pw + r, np.where(held_r, self.right_x - r, self.bx))
+        self.by = np.where(held_l, self.ly + self.ph / 2, np.where(held_r, self.ry + self.ph / 2, self.by))
+        held = held_l | held_r
+        self.launch_ms = np.where(held, np.maximum(0, self.launch_ms - self.dt_ms), self.launch_ms)
+        launch = held & (self.launch_ms == 0)
+        self.vx = np.where(launch, np.where(held_l, self.speed, -self.speed), self.vx)
+        self.vy = np.where(launch, 0.0, self.vy)
+        self.held[launch] = 0
+
+        # Scoring
+        right_pt = self.bx + r < 0
+        left_pt = self.bx - r > w
+        self.rscore += right_pt
+        self.lscore += left_pt
+        scored = right_pt | left_pt
+        if scored.any():
+            self._give_possession(scored, np.where(right_pt, 1, 2).astype(np.int8))
+        rewards = left_pt.astype(np.float32) - right_pt.astype(np.float32)
+
+        dones = (self.lscore >= cfg.WINNING_SCORE) | (self.rscore >= cfg.WINNING_SCORE)
+        info = {}
+        if dones.any():
+            info["winner"] = np.where(dones, np.where(self.lscore > self.rscore, 1, 2), 0)
+            self._reset_matches(dones)
+        return self._obs(), rewards, dones, info
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized batch simulator")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--left-ai", default="Medium")
+    parser.add_argument("--right-ai", default="Medium")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    env = BatchPong(args.envs, left_ai=args.left_ai, right_ai=args.right_ai, seed=args.seed)
+    env.reset()
+    finished = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, dones, _ = env.step()
+        finished += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{env.frames} frames in {elapsed:.3f}s ({env.frames / elapsed / 1e6:.2f}M frames/s), {finished} matches finished")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+import config as cfg
+from ai import AIState, PROFILES, _predict_ball_y_at_x, move_ai_paddle
+from ball import Ball
+from engine import GameState, PADDLE_MARGIN
+from paddle import Paddle
+from physics import handle_collision
+
+
+# A case builds its fixtures and returns run(n), which performs n units of
+# work (calls, or ticks for the throughput cases); results are us per unit.
+CASES: Dict[str, Callable[[], Callable[[int], None]]] = {}
+
+
+def case(name: str):
+    def register(builder):
+        CASES[name] = builder
+        return builder
+    return register
+
+
+def _paddles() -> tuple[Paddle, Paddle]:
+    top = cfg.WINDOW_HEIGHT // 2 - cfg.PADDLE_HEIGHT // 2
+    return (Paddle(PADDLE_MARGIN, top, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED),
+            Paddle(cfg.WINDOW_WIDTH - PADDLE_MARGIN - cfg.PADDLE_WIDTH, top, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED))
+
+
+def _collision_case(x: float, y: float, vel_x: float, vel_y: float) -> Callable[[int], None]:
+    """handle_collision on a ball placed right after a move() to (x, y); the reset is part of each call."""
+    left, right = _paddles()
+    ball = Ball(x, y, cfg.BALL_RADIUS, vel_x, vel_y)
+    events: list[str] = []
+    height = cfg.WINDOW_HEIGHT
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            ball.x, ball.y, ball.vel_x, ball.vel_y = x, y, vel_x, vel_y
+            handle_collision(ball, left, right, cfg.BALL_SPEED, height, cfg.MAX_BOUNCE_ANGLE_DEG, events)
+            events.clear()
+    return run
+
+
+@case("physics.collision.miss")
+def _physics_miss():
+    return _collision_case(cfg.WINDOW_WIDTH / 2, cfg.WINDOW_HEIGHT / 2, 12.0, 3.0)
+
+
+@case("physics.collision.wall")
+def _physics_wall():
+    return _collision_case(cfg.WINDOW_WIDTH / 2, cfg.BALL_RADIUS - 2.0, 10.0, -6.0)
+
+
+@case("physics.collision.paddle")
+def _physics_paddle():
+    face = PADDLE_MARGIN + cfg.PADDLE_WIDTH + cfg.BALL_RADIUS
+    return _collision_case(face - 4.0, cfg.WINDOW_HEIGHT / 2 + 20, -12.0, 1.0)
+
+
+def _ball_trace(ticks: int = 4000) -> list[tuple[float, float, float, float]]:
+    """Ball states of a real Medium-vs-Medium match, so AI cases see realistic trajectories."""
+    state = GameState(left_ai="Medium", right_ai="Medium", seed=1)
+    trace = []
+    dt_ms = 1000.0 / cfg.TICK_RATE
+    while len(trace) < ticks:
+        state.step(0, dt_ms)
+        if state.winner is not None:
+            state.reset_match()
+        ball = state.ball
+        if state.held_by is None:
+            trace.append((ball.x, ball.y, ball.vel_x, ball.vel_y))
+    return trace
+
+
+def _ai_case(level: str) -> Callable[[], Callable[[int], None]]:
+    def build():
+        trace = _ball_trace()
+        _, paddle = _paddles()
+        ball = Ball(0, 0, cfg.BALL_RADIUS, 0, 0)
+        state = AIState(PROFILES[level], cfg.PADDLE_SPEED)
+        height = cfg.WINDOW_HEIGHT
+        rng = random.Random(0)
+
+        def run(n: int) -> None:
+            size = len(trace)
+            for i in range(n):
+                ball.x, ball.y, ball.vel_x, ball.vel_y = trace[i % size]
+                move_ai_paddle(paddle, ball, state, height, rng)
+        return run
+    return build
+
+
+for _level in PROFILES:
+    CASES[f"ai.move.{_level}"] = _ai_case(_level)
+
+
+@case("ai.predict")
+def _ai_predict():
+    trace = _ball_trace()
+    ball = Ball(0, 0, cfg.BALL_RADIUS, 0, 0)
+    target_x = cfg.WINDOW_WIDTH - PADDLE_MARGIN - cfg.PADDLE_WIDTH
+    height = cfg.WINDOW_HEIGHT
+
+    def run(n: int) -> None:
+        size = len(trace)
+        for i in range(n):
+            ball.x, ball.y, ball.vel_x, ball.vel_y = trace[i % size]
+            _predict_ball_y_at_x(ball, target_x, height)
+    return run
+
+
+@case("headless.tick")
+def _headless_tick():
+    """End-to-end: one GameState.step of a Medium-vs-Hard match per unit."""
+    state = GameState(left_ai="Medium", right_ai="Hard", seed=2)
+    dt_ms = 1000.0 / cfg.TICK_RATE
+
+    def run(n: int) -> None:
+        step = state.step
+        for _ in range(n):
+            step(0, dt_ms)
+            if state.winner is not None:
+                state.reset_match()
+    return run
+
+
+# -- rendering (SDL dummy video driver) ------------------------------------
+_display = {}
+
+
+def _window():
+    """Display surface and fonts, created once; the dummy driver is used unless SDL_VIDEODRIVER is set."""
+    if not _display:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from fonts import get_font
+        pygame.display.init()
+        pygame.font.init()
+        _display["window"] = pygame.display.set_mode((cfg.WINDOW_WIDTH, cfg.WINDOW_HEIGHT))
+        _display["score_font"] = get_font("consolas", 40, bold=True)
+        _display["large_font"] = get_font("consolas", 72, bold=True)
+    return _display["window"], _display["score_font"], _display["large_font"]
+
+
+def _draw_case(interpolate: bool):
+    def build():
+        import ui
+        window, font, _ = _window()
+        state = GameState(left_ai="Medium", right_ai="Hard", seed=3)
+        for _ in range(200):
+            state.step(0, 1000.0 / cfg.TICK_RATE)
+        prev = state.positions() if interpolate else None
+
+        def run(n: int) -> None:
+            for _ in range(n):
+                ui.draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score,
+                        "Left", "Right", font, prev, 0.5)
+        return run
+    return build
+
+
+CASES["ui.draw"] = _draw_case(False)
+CASES["ui.draw.interpolated"] = _draw_case(True)
+
+
+@case("ui.dirty")
+def _ui_dirty():
+    import ui
+    window, font, _ = _window()
+    state = GameState(left_ai="Medium", right_ai="Hard", seed=3)
+    renderer = ui.DirtyRenderer()
+    dt_ms = 1000.0 / cfg.TICK_RATE
+
+    def run(n: int) -> None:
+        # Includes one simulation tick per frame so the sprites actually move
+        for _ in range(n):
+            prev = state.positions()
+            state.step(0, dt_ms)
+            renderer.draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score,
+                          "Left", "Right", font, prev, 0.5)
+            if state.winner is not None:
+                state.reset_match()
+    return run
+
+
+@case("ui.winner")
+def _ui_winner():
+    import ui
+    window, font, large = _window()
+
+    def run(n: int) -> None:
+        for i in range(n):
+            ui.draw_winner(window, "Left wins!", large, font, i & 1, (0, 0))
+    return run
+
+
+def _menu_case(show: Callable[[], object]):
+    """One full frame of an interactive menu per call: each flip queues Enter, which the next loop pass accepts."""
+    def build():
+        import pygame
+        _window()
+        confirm = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0, scancode=40)
+
+        def run(n: int) -> None:
+            flip = pygame.display.flip
+
+            def flip_and_confirm() -> None:
+                flip()
+                pygame.event.post(confirm)
+            pygame.display.flip = flip_and_confirm
+            try:
+                for _ in range(n):
+                    show()
+            finally:
+                pygame.display.flip = flip
+        return run
+    return build
+
+
+@case("ui.menu.main")
+def _menu_main():
+    import ui
+    window, font, large = _window()
+    return _menu_case(lambda: ui.show_main_menu(window, large, font))()
+
+
+@case("ui.menu.difficulty")
+def _menu_difficulty():
+    import ui
+    window, font, _ = _window()
+    return _menu_case(lambda: ui.screen_ai_difficulty(window, font, list(PROFILES)))()
+
+
+@case("ui.menu.name")
+def _menu_name():
+    import ui
+    window, font, _ = _window()
+    return _menu_case(lambda: ui.prompt_for_name(window, "Enter Your Name:", "Player", font))()
+
+
+# -- measurement ------------------------------------------------------------
+def _calibrate(run: Callable[[int], None], min_time_s: float) -> tuple[int, float]:
+    """Grow n until one run(n) takes at least min_time_s; returns n and that run's time."""
+    n = 1
+    while True:
+        elapsed = _time(run, n)
+        if elapsed >= min_time_s:
+            return n, elapsed
+        n *= 2 if elapsed < min_time_s / 4 else 1.5
+        n = int(n)
+
+
+def _time(run: Callable[[int], None], n: int) -> float:
+    start = time.perf_counter()
+    run(n)
+    return time.perf_counter() - start
+
+
+def _result(samples: list[float], n: int) -> dict:
+    per_unit = [s / n * 1e6 for s in samples]
+    return {"us": min(per_unit), "median_us": statistics.median(per_unit), "n": n, "repeat": len(samples)}
+
+
+def run_suite(pattern: str = "*", min_time_s: float = 0.05, repeat: int = 5, log=None) -> dict:
+    """Like timeit for every case matching pattern: grow n until one run takes
+    min_time_s, then keep the best of `repeat` runs. The repeats are taken in
+    rounds over all the cases.
+
+    On a shared or throttled machine a slow spell then costs each case one
+    sample among several spread over the whole run, instead of every sample
+    of whichever case happened to be running.
+    """
+    runs = {name: build() for name, build in CASES.items() if fnmatch.fnmatch(name, pattern)}
+    calibrated = {name: _calibrate(run, min_time_s) for name, run in runs.items()}
+    samples = {name: [first] for name, (_, first) in calibrated.items()}
+    for _ in range(repeat - 1):
+        for name, run in runs.items():
+            samples[name].append(_time(run, calibrated[name][0]))
+    results = {}
+    for name in runs:
+        results[name] = _result(samples[name], calibrated[name][0])
+        if log:
+            log(f"{name:28s} {results[name]['us']:10.3f} us  (median {results[name]['median_us']:.3f}, n={results[name]['n']})")
+    return {"meta": _meta(), "results": results}
+
+
+def _meta() -> dict:
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if "pygame" in sys.modules:
+        meta["pygame"] = sys.modules["pygame"].version.ver
+    return meta
+
+
+def _parse_thresholds(text: str) -> Dict[str, float]:
+    thresholds = {}
+    for item in filter(None, text.split(",")):
+        pattern, _, value = item.partition("=")
+        thresholds[pattern] = float(value)
+    return thresholds
+
+
+def compare(current: dict, baseline: dict, threshold: float, overrides: Optional[Dict[str, float]] = None,
+            pattern: str = "*") -> tuple[list[str], list[str]]:
+    """Report lines and the names of cases slower than baseline by more than their threshold.
+
+    A case's threshold is the first matching pattern in overrides, else
+    threshold; both are fractions (0.2 = 20% slower fails). Cases missing
+    from either side are listed but never fail; baseline cases outside
+    pattern (not run this time) are left out.
+    """
+    overrides = overrides or {}
+    lines = [f"{'case':28s}{'baseline us':>13s}{'current us':>13s}{'change':>9s}{'limit':>8s}"]
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in current["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            lines.append(f"{name:28s}{'-':>13s}{result['us']:13.3f}{'new':>9s}")
+            continue
+        limit = next((value for pattern, value in overrides.items() if fnmatch.fnmatch(name, pattern)), threshold)
+        change = result["us"] / base["us"] - 1.0
+        failed = change > limit
+        if failed:
+            regressions.append(name)
+        lines.append(f"{name:28s}{base['us']:13.3f}{result['us']:13.3f}{change:+9.1%}{limit:8.0%}" + ("  REGRESSION" if failed else ""))
+    for name in base_results:
+        if name not in current["results"] and fnmatch.fnmatch(name, pattern):
+            lines.append(f"{name:28s}{base_results[name]['us']:13.3f}{'-':>13s}{'gone':>9s}")
+    return lines, regressions
+
+
+def save_baseline(results: dict, path: str) -> None:
+    """Write results as the baseline, keeping stored cases that were not run this time."""
+    merged = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as fh:
+            merged = json.load(fh).get("results", {})
+    merged.update(results["results"])
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"meta": results["meta"], "results": merged}, fh, indent=2)
+        fh.write("\n")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the physics, AI, rendering and headless hot paths")
+    parser.add_argument("--only", default="*", metavar="GLOB", help="run only matching cases, e.g. 'physics.*'")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed run (n is grown to reach it)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case; the fastest counts")
+    parser.add_argument("--out", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline (merged into it with --only)")
+    parser.add_argument("--baseline", metavar="FILE", default=cfg.BENCH_BASELINE_PATH,
+                        help="results to compare against (default: the committed bench_baseline.json)")
+    parser.add_argument("--no-compare", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown vs. baseline, as a fraction")
+    parser.add_argument("--thresholds", type=_parse_thresholds, default={}, metavar="GLOB=FRACTION,...",
+                        help="per-case limits, e.g. 'ui.*=0.5,headless.*=0.1'")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return
+    results = run_suite(args.only, args.min_time, args.repeat, log=print)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"results written to {args.out}")
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"baseline written to {args.baseline}")
+        return
+    if args.no_compare:
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; store one with --save")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    lines, regressions = compare(results, baseline, args.threshold, args.thresholds, args.only)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
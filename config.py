@@ -1,8 +1,47 @@
-# Window configuration (default)
+import os
+
+# Playfield in simulation units: physics and layout use these whatever the
+# render or window size, and gameplay speeds are tuned to them; keep them fixed
 WINDOW_WIDTH = 960
 WINDOW_HEIGHT = 540
+# Internal render resolution (the canvas, see screen.py); the playfield is
+# scaled onto it, so weak devices can lower it (None = the playfield size)
+RENDER_SIZE = None
+# How the canvas is scaled to the window: "scaled" (pygame.SCALED, GPU where
+# available), "integer" (whole-number factor, letterboxed) or "smooth";
+# window size for the latter two (None = the playfield size), and fullscreen
+RENDER_SCALING = "scaled"
+SCALE_MODES = ("scaled", "integer", "smooth")
+WINDOW_SIZE = None
+FULLSCREEN = False
 FPS = 80
 
+# Simulation runs at a fixed TICK_RATE (gameplay speeds are per tick);
+# rendering is capped at RENDER_FPS (0 = uncapped) and interpolates between ticks
+TICK_RATE = 80
+RENDER_FPS = 144
+MAX_TICKS_PER_FRAME = 5
+
+# Frame pacing (see pacing.py): sleep, busy, hybrid, vsync or uncapped, and
+# how long before the deadline hybrid pacing stops sleeping and spins
+PACING = "sleep"
+PACING_MODES = ("sleep", "busy", "hybrid", "vsync", "uncapped")
+PACING_SPIN_MS = 2.0
+# Frame-time statistics (F5 overlay): recent frames kept for percentiles,
+# and the histogram's bin width and range (longer frames share the last bin)
+FRAME_TIME_SAMPLES = 1200
+FRAME_TIME_BIN_MS = 0.5
+FRAME_TIME_MAX_MS = 50.0
+
+# Repaint only changed regions with pygame.display.update(rects) during play
+DIRTY_RECTS = False
+
+# Maximum number of rendered text surfaces kept by textcache
+TEXT_CACHE_SIZE = 256
+
+# Menus and prompts sleep in pygame.event.wait() for at most this long between redraws
+IDLE_WAIT_MS = 250
+
 # Colors (RGB)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -27,4 +66,52 @@ WIN_MESSAGE_DURATION_MS = 5000
 TITLE_IMAGE_PNG = "assets/retro_pong.png"
 TITLE_IMAGE_JPG = "assets/retro_pong.jpg"
 
+SND_HIT_WAV = "assets/pong_hit.wav"
+SND_SCORE_WAV = "assets/pong_score.wav"
+SND_WIN_WAV = "assets/pong_win.wav"
+SND_WALL_WAV = None  # no wall sound by default
+
+# Audio: mixer buffer in samples (lower = less latency, more risk of underruns),
+# mixer channels reserved per voice group, and how stale a queued event may get
+AUDIO_BUFFER = 512
+AUDIO_VOICES = {"paddle": 2, "score": 1, "win": 1}
+AUDIO_MAX_DELAY_MS = 100
+
+# Resolved system font paths are cached here between runs
+FONT_CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pong", "fonts.json")
+
+# AI difficulty levels (see ai.AIProfile); levels are added or retuned in
+# this JSON file, and built-in defaults are used if it is missing
+AI_PROFILES_PATH = os.environ.get("PONG_AI_PROFILES") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_profiles.json")
+# Default weights file of the learned level (see learned.py)
+LEARNED_AI_WEIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_learned.npz")
+
+# Frame profiler (F3 toggles its overlay, F4 exports): frames kept in its
+# ring buffer, and the export file (.csv, else Chrome trace JSON)
+FRAME_PROFILE_FRAMES = 600
+FRAME_PROFILE_PATH = "frame_profile.json"
+
+# Multi-ball party mode (see multiball.py): ball radius, default ball count
+# for --multiball, and points to win
+MULTIBALL_RADIUS = 5
+MULTIBALL_BALLS = 50
+MULTIBALL_WINNING_SCORE = 100
+
+# Stored benchmark results that bench.py compares against (bench.py --save
+# refreshes them)
+BENCH_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Replays: directory to record every match into (None = off); see replay.py
+REPLAY_DIR = None
+
+# Netplay (see netplay.py): UDP port, local input delay and how far ahead of
+# the last confirmed remote input a peer may predict, in ticks
+NET_PORT = 47800
+NET_INPUT_DELAY = 2
+NET_MAX_PREDICTION = 12
+NET_TIMEOUT_S = 5.0
+
+# Match server (see server.py)
+SERVER_PORT = 47801
+
 
@@ -0,0 +1,251 @@
+import hashlib
+import math
+import random
+import struct
+import time
+from typing import Dict, Optional
+
+import config as cfg
+from ai import AIProfile, AIState, move_ai_paddle, PROFILES
+from ball import Ball
+from frameprof import PH_PADDLES, PH_PHYSICS
+from paddle import Paddle
+from physics import handle_collision
+
+
+# Per-tick input bitmask
+IN_LEFT_UP = 1
+IN_LEFT_DOWN = 2
+IN_RIGHT_UP = 4
+IN_RIGHT_DOWN = 8
+IN_LEFT_LAUNCH = 16
+IN_RIGHT_LAUNCH = 32
+
+AI_LAUNCH_DELAY_MS = 700
+PADDLE_MARGIN = 40
+
+
+class GameState:
+    """Display-free state of a single match plus the rules that advance it.
+
+    Either side may be driven by an AI difficulty level (left_ai/right_ai, a
+    key of profiles) or by the input bitmask passed to step(). Events raised during the last step
+    ("launch", "hit", "wall", "score", "win") are collected in self.events.
+
+    All randomness (possession, AI jitter) comes from self.rng, reseeded from
+    self.seed at every reset_match(), so a match is reproducible from its seed
+    and per-tick inputs.
+
+    If self.profiler is set to a frameprof.FrameProfiler, step() laps its
+    paddle and physics phases.
+    """
+
+    def __init__(self, width: int = cfg.WINDOW_WIDTH, height: int = cfg.WINDOW_HEIGHT,
+                 left_ai: Optional[str] = None, right_ai: Optional[str] = None,
+                 seed: Optional[int] = None, profiles: Dict[str, AIProfile] = PROFILES) -> None:
+        self.width = width
+        self.height = height
+        self.profiles = profiles
+        self.rng = random.Random()
+
+        self.left_paddle = Paddle(PADDLE_MARGIN, height // 2 - cfg.PADDLE_HEIGHT // 2, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+        self.right_paddle = Paddle(width - PADDLE_MARGIN - cfg.PADDLE_WIDTH, height // 2 - cfg.PADDLE_HEIGHT // 2, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+        self.ball = Ball(width / 2, height / 2, cfg.BALL_RADIUS, 0, 0)
+
+        # Mirrored stand-ins so the right-side AI can also drive the left paddle
+        self._mirror_ball = Ball(0, 0, cfg.BALL_RADIUS, 0, 0)
+        self._mirror_paddle = Paddle(width - PADDLE_MARGIN - cfg.PADDLE_WIDTH, 0, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+
+        self.events: list[str] = []
+        self.profiler = None
+        self.set_ai('left', left_ai)
+        self.set_ai('right', right_ai)
+        self.reset_match(seed)
+
+    def reset_match(self, seed: Optional[int] = None) -> None:
+        """Start a new match; without a seed a fresh one is drawn from the OS-seeded global RNG."""
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.left_score = 0
+        self.right_score = 0
+        self.winner: Optional[str] = None
+        self.tick = 0
+        if self.left_ai_state:
+            self.left_ai_state.reset()
+        if self.right_ai_state:
+            self.right_ai_state.reset()
+        self.left_paddle.y = self.height // 2 - cfg.PADDLE_HEIGHT // 2
+        self.right_paddle.y = self.height // 2 - cfg.PADDLE_HEIGHT // 2
+        self.ball.reset_to_center(self.width, self.height, reverse_horizontal=True)
+        self.give_possession(self.rng.choice(['left', 'right']))
+
+    def give_possession(self, side: str) -> None:
+        """Hand the ball to side; it stays attached until launched."""
+        self.ball.vel_x = 0
+        self.ball.vel_y = 0
+        self.held_by: Optional[str] = side
+        self.current_speed = cfg.BALL_SPEED
+        self.rally_hits = 0
+        is_ai = self.left_ai if side == 'left' else self.right_ai
+        self.ai_launch_cooldown_ms = AI_LAUNCH_DELAY_MS if is_ai else 0
+
+    def set_ai(self, side: str, level: Optional[str]) -> None:
+        """Switch a side's AI level (None = input-driven); its profile is resolved here, once."""
+        ai_state = AIState(self.profiles[level], cfg.PADDLE_SPEED, self.width) if level else None
+        if side == 'left':
+            self.left_ai = level
+            self.left_ai_state = ai_state
+        else:
+            self.right_ai = level
+            self.right_ai_state = ai_state
+
+    def positions(self) -> tuple[float, float, float, float]:
+        """(ball_x, ball_y, left_paddle_y, right_paddle_y) for render interpolation."""
+        return (self.ball.x, self.ball.y, self.left_paddle.y, self.right_paddle.y)
+
+    def checksum(self) -> bytes:
+        """8-byte digest of the simulation state, for verifying replays."""
+        packed = struct.pack("<6d4i", self.ball.x, self.ball.y, self.ball.vel_x, self.ball.vel_y,
+                             self.left_paddle.y, self.right_paddle.y, self.left_score, self.right_score,
+                             self.tick, self.rally_hits)
+        return hashlib.blake2b(packed, digest_size=8).digest()
+
+    def snapshot(self) -> tuple:
+        """Capture everything step() reads or writes, for rollback via restore()."""
+        ball = self.ball
+        return (ball.x, ball.y, ball.vel_x, ball.vel_y, self.left_paddle.y, self.right_paddle.y,
+                self.left_score, self.right_score, self.winner, self.tick, self.held_by,
+                self.current_speed, self.rally_hits, self.ai_launch_cooldown_ms,
+                self.left_ai_state.save() if self.left_ai_state else None,
+                self.right_ai_state.save() if self.right_ai_state else None, self.rng.getstate())
+
+    def restore(self, snap: tuple) -> None:
+        ball = self.ball
+        (ball.x, ball.y, ball.vel_x, ball.vel_y, self.left_paddle.y, self.right_paddle.y,
+         self.left_score, self.right_score, self.winner, self.tick, self.held_by,
+         self.current_speed, self.rally_hits, self.ai_launch_cooldown_ms,
+         left_ai_state, right_ai_state, rng_state) = snap
+        if self.left_ai_state and left_ai_state:
+            self.left_ai_state.load(left_ai_state)
+        if self.right_ai_state and right_ai_state:
+            self.right_ai_state.load(right_ai_state)
+        self.rng.setstate(rng_state)
+
+    def _launch(self) -> None:
+        direction = 1 if self.held_by == 'left' else -1
+        self.ball.vel_x = direction * self.current_speed
+        self.ball.vel_y = 0
+        self.held_by = None
+        self.events.append("launch")
+
+    def _move_left_ai(self) -> None:
+        mb, mp, lp = self._mirror_ball, self._mirror_paddle, self.left_paddle
+        mb.x = self.width - self.ball.x
+        mb.y = self.ball.y
+        mb.vel_x = -self.ball.vel_x
+        mb.vel_y = self.ball.vel_y
+        mp.y = lp.y
+        move_ai_paddle(mp, mb, self.left_ai_state, self.height, self.rng)
+        lp.y = mp.y
+
+    def step(self, inputs: int, dt_ms: float) -> None:
+        """Advance the match by one frame using the given input bitmask."""
+        self.events.clear()
+        if self.winner is not None:
+            return
+        self.tick += 1
+        ball = self.ball
+        left, right = self.left_paddle, self.right_paddle
+
+        # Human launch from possession
+        if self.held_by == 'left' and not self.left_ai and inputs & IN_LEFT_LAUNCH:
+            self._launch()
+        elif self.held_by == 'right' and not self.right_ai and inputs & IN_RIGHT_LAUNCH:
+            self._launch()
+
+        # Paddles
+        if not self.left_ai:
+            if inputs & IN_LEFT_UP:
+                left.move_up(self.height)
+            if inputs & IN_LEFT_DOWN:
+                left.move_down(self.height)
+        elif self.held_by is None:
+            self._move_left_ai()
+        if not self.right_ai:
+            if inputs & IN_RIGHT_UP:
+                right.move_up(self.height)
+            if inputs & IN_RIGHT_DOWN:
+                right.move_down(self.height)
+        elif self.held_by is None:
+            move_ai_paddle(right, ball, self.right_ai_state, self.height, self.rng)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap(PH_PADDLES)
+
+        # Ball update (possession-aware)
+        if self.held_by is None:
+            ball.move()
+            if handle_collision(ball, left, right, self.current_speed, self.height, cfg.MAX_BOUNCE_ANGLE_DEG, self.events):
+                self.rally_hits += 1
+                if self.rally_hits % cfg.HITS_PER_SPEEDUP == 0:
+                    self.current_speed = min(cfg.MAX_BALL_SPEED, self.current_speed + cfg.SPEED_INCREMENT)
+                    mag = math.hypot(ball.vel_x, ball.vel_y)
+                    if mag > 0:
+                        scale = self.current_speed / mag
+                        ball.vel_x *= scale
+                        ball.vel_y *= scale
+        else:
+            holder = left if self.held_by == 'left' else right
+            if self.held_by == 'left':
+                ball.x = left.x + left.width + ball.radius
+            else:
+                ball.x = right.x - ball.radius
+            ball.y = holder.center_y
+            # AI auto-launch after small delay
+            if self.left_ai if self.held_by == 'left' else self.right_ai:
+                self.ai_launch_cooldown_ms = max(0, self.ai_launch_cooldown_ms - dt_ms)
+                if self.ai_launch_cooldown_ms == 0:
+                    self._launch()
+        if profiler is not None:
+            profiler.lap(PH_PHYSICS)
+
+        # Scoring
+        if ball.x + ball.radius < 0:
+            self.right_score += 1
+            self.give_possession('left')
+            self.events.append("score")
+        elif ball.x - ball.radius > self.width:
+            self.left_score += 1
+            self.give_possession('right')
+            self.events.append("score")
+        else:
+            return
+
+        if self.left_score >= cfg.WINNING_SCORE or self.right_score >= cfg.WINNING_SCORE:
+            self.winner = 'left' if self.left_score > self.right_score else 'right'
+            self.held_by = None
+            self.events.append("win")
+
+
+def run_headless(matches: int, seed: int = 0, left_ai: str = "Medium", right_ai: str = "Medium", max_ticks: int = 48000) -> dict:
+    """Play AI-vs-AI matches as fast as possible and return aggregate results.
+
+    Matches that do not finish within max_ticks frames count as timeouts.
+    """
+    dt_ms = 1000.0 / cfg.TICK_RATE
+    results = {"matches": matches, "left_wins": 0, "right_wins": 0, "timeouts": 0, "ticks": 0}
+    start = time.perf_counter()
+    for i in range(matches):
+        state = GameState(left_ai=left_ai, right_ai=right_ai, seed=seed * 1_000_003 + i)
+        step = state.step
+        while state.winner is None and state.tick < max_ticks:
+            step(0, dt_ms)
+        results["ticks"] += state.tick
+        if state.winner == 'left':
+            results["left_wins"] += 1
+        elif state.winner == 'right':
+            results["right_wins"] += 1
+        else:
+            results["timeouts"] += 1
+    results["elapsed_s"] = time.perf_counter() - start
+    return results
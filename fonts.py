@@ -0,0 +1,62 @@
+import json
+import os
+
+import pygame
+
+import config as cfg
+
+
+# Shared Font objects keyed by (name, size, bold)
+_fonts: dict = {}
+# name|bold -> [font path or None, fake bold]; persisted to FONT_CACHE_PATH
+_resolved: dict | None = None
+
+
+def _load_resolved() -> dict:
+    global _resolved
+    if _resolved is None:
+        try:
+            with open(cfg.FONT_CACHE_PATH, "r", encoding="utf-8") as fh:
+                _resolved = json.load(fh)
+        except (OSError, ValueError):
+            _resolved = {}
+    return _resolved
+
+
+def _save_resolved() -> None:
+    try:
+        os.makedirs(os.path.dirname(cfg.FONT_CACHE_PATH), exist_ok=True)
+        with open(cfg.FONT_CACHE_PATH, "w", encoding="utf-8") as fh:
+            json.dump(_resolved, fh, indent=1)
+    except OSError:
+        pass
+
+
+def resolve_font(name: str, bold: bool = False) -> tuple[str | None, bool]:
+    """(font file, needs fake bold) that pygame.font.SysFont would pick.
+
+    Results are cached on disk so later runs skip the system font scan.
+    """
+    resolved = _load_resolved()
+    key = f"{name}|{int(bold)}"
+    entry = resolved.get(key)
+    if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+        return entry[0], entry[1]
+    # SysFont hands its choice to the constructor; capture it instead of building a font
+    path, fake_bold, _ = pygame.font.SysFont(name, 0, bold=bold, constructor=lambda path, size, b, i: (path, b, i))
+    resolved[key] = [path, fake_bold]
+    _save_resolved()
+    return path, fake_bold
+
+
+def get_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    """Equivalent of pygame.font.SysFont(name, size, bold) with identical fonts shared."""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path, fake_bold = resolve_font(name, bold)
+        font = pygame.font.Font(path, size)
+        if fake_bold:
+            font.set_bold(True)
+        _fonts[key] = font
+    return font
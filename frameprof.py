@@ -0,0 +1,177 @@
+import json
+import time
+from array import array
+from typing import Optional, Sequence
+
+
+# Phases of a game-loop frame, in the order they run
+PH_WAIT = 0      # frame pacing (clock.tick)
+PH_EVENTS = 1    # event pumping and handling
+PH_PADDLES = 2   # paddle movement from input and AI (engine)
+PH_PHYSICS = 3   # ball movement and collisions (engine)
+PH_SIM = 4       # rest of the fixed-rate ticks: rules, recording, audio events
+PH_DRAW = 5      # playfield rendering
+PH_HUD = 6       # this profiler's overlay
+PH_PRESENT = 7   # display.flip / display.update
+PHASES = ("wait", "events", "paddles", "physics", "sim", "draw", "hud", "present")
+
+LAPS_PER_FRAME = 32  # lap ring size relative to the frame ring, for trace export
+
+
+class FrameProfiler:
+    """Per-frame phase timings of the last `capacity` frames in preallocated ring buffers.
+
+    The game loop calls begin_frame() once per frame and lap(phase) at the end
+    of each phase: the time since the previous lap is charged to that phase.
+    A phase may lap several times per frame (once per simulation tick) and
+    its times add up. Individual laps are also kept, for trace export.
+
+    When disabled every call returns at once, so the calls can stay in the
+    loop. Switch it with enable() and disable(), which may be called
+    anywhere in a frame: enable() starts measuring afresh from that point.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 600, phases: Sequence[str] = PHASES) -> None:
+        self.enabled = enabled
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        width = len(self.phases)
+        self.frames = 0  # frames begun since creation
+        # One spare row past the ring takes laps that belong to no recorded frame
+        self._phase_ms = array("d", bytes(8 * (capacity + 1) * width))
+        self._frame_start = array("d", bytes(8 * capacity))
+        self._frame_ms = array("d", bytes(8 * capacity))
+        self._zero_row = array("d", bytes(8 * width))
+        self._discard_row = capacity * width
+        self._row = self._discard_row
+        self._open = False  # the last frame begun is still running; its length is recorded by the next begin_frame()
+        self._last = time.perf_counter()
+        self.laps = 0  # laps recorded since creation
+        self._lap_capacity = capacity * LAPS_PER_FRAME
+        self._lap_phase = array("B", bytes(self._lap_capacity))
+        self._lap_start = array("d", bytes(8 * self._lap_capacity))
+        self._lap_ms = array("d", bytes(8 * self._lap_capacity))
+        self.origin = time.perf_counter()
+
+    def enable(self) -> None:
+        """Start (or resume) profiling from this point of the current frame.
+
+        The frame that was running when profiling stopped is dropped, and the
+        rest of the current frame is timed but not recorded, so the time spent
+        disabled shows up in neither a phase nor a frame length.
+        """
+        if self.enabled:
+            return
+        if self._open:
+            self.frames -= 1
+            self._open = False
+        self._row = self._discard_row
+        self._last = time.perf_counter()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._open:
+            prev = (self.frames - 1) % self.capacity
+            self._frame_ms[prev] = (now - self._frame_start[prev]) * 1000.0
+        slot = self.frames % self.capacity
+        width = len(self.phases)
+        row = slot * width
+        self._phase_ms[row:row + width] = self._zero_row
+        self._frame_start[slot] = now
+        self._row = row
+        self._last = now
+        self._open = True
+        self.frames += 1
+
+    def lap(self, phase: int) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        ms = (now - self._last) * 1000.0
+        self._phase_ms[self._row + phase] += ms
+        slot = self.laps % self._lap_capacity
+        self._lap_phase[slot] = phase
+        self._lap_start[slot] = self._last
+        self._lap_ms[slot] = ms
+        self.laps += 1
+        self._last = now
+
+    # -- reading ----------------------------------------------------------
+    def _completed(self) -> range:
+        """Ring slots of finished frames, oldest first."""
+        done = max(0, self.frames - 1) if self._open else self.frames
+        count = min(done, self.capacity - 1)
+        return range(done - count, done)
+
+    def frame_times(self, count: Optional[int] = None) -> list[float]:
+        """Total ms of the last count finished frames, oldest first."""
+        frames = self._completed()
+        if count is not None:
+            frames = frames[-count:]
+        return [self._frame_ms[f % self.capacity] for f in frames]
+
+    def stats(self) -> list[tuple[str, float, float]]:
+        """(name, mean ms, p99 ms) per phase and for whole frames, over the buffered frames."""
+        frames = self._completed()
+        if not frames:
+            return []
+        width = len(self.phases)
+        result = []
+        for p, name in enumerate(self.phases):
+            result.append((name, *_mean_p99([self._phase_ms[(f % self.capacity) * width + p] for f in frames])))
+        result.append(("frame", *_mean_p99(self.frame_times())))
+        return result
+
+    def report(self) -> str:
+        lines = [f"frame profile ({len(self._completed())} frames):"]
+        for name, mean, p99 in self.stats():
+            lines.append(f"  {name:10s} avg {mean:7.3f} ms  p99 {p99:7.3f} ms")
+        return "\n".join(lines)
+
+    # -- export -----------------------------------------------------------
+    def export(self, path: str) -> None:
+        """Write the buffered frames as CSV (path ending in .csv) or as Chrome trace JSON."""
+        if path.lower().endswith(".csv"):
+            self._export_csv(path)
+        else:
+            self._export_trace(path)
+
+    def _export_csv(self, path: str) -> None:
+        width = len(self.phases)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("frame,start_ms,frame_ms," + ",".join(f"{name}_ms" for name in self.phases) + "\n")
+            for f in self._completed():
+                slot = f % self.capacity
+                start_ms = (self._frame_start[slot] - self.origin) * 1000.0
+                phases = ",".join(f"{self._phase_ms[slot * width + p]:.4f}" for p in range(width))
+                fh.write(f"{f},{start_ms:.4f},{self._frame_ms[slot]:.4f},{phases}\n")
+
+    def _export_trace(self, path: str) -> None:
+        """Chrome trace event format (chrome://tracing, Perfetto): one slice per frame and per lap."""
+        events = []
+        frames = self._completed()
+        first_start = self._frame_start[frames[0] % self.capacity] if frames else self.origin
+        for f in frames:
+            slot = f % self.capacity
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1, "args": {"frame": f},
+                           "ts": (self._frame_start[slot] - self.origin) * 1e6, "dur": self._frame_ms[slot] * 1e3})
+        for i in range(max(0, self.laps - self._lap_capacity), self.laps):
+            slot = i % self._lap_capacity
+            start = self._lap_start[slot]
+            if start < first_start:
+                continue
+            events.append({"name": self.phases[self._lap_phase[slot]], "ph": "X", "pid": 1, "tid": 1,
+                           "ts": (start - self.origin) * 1e6, "dur": self._lap_ms[slot] * 1e3})
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+
+
+def _mean_p99(values: list[float]) -> tuple[float, float]:
+    ordered = sorted(values)
+    return sum(ordered) / len(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
@@ -0,0 +1,526 @@
+import argparse
+import gc
+import sys
+import time
+
+import pygame
+import assets
+import config as cfg
+import screen
+from ai import AI_LEVELS
+from ui import DirtyRenderer, PacingHUD, ProfilerHUD, wait_events, was_exposed, level_index_for_key, draw_banner, draw_multiball, draw as ui_draw, draw_winner as ui_draw_winner, show_main_menu as ui_show_main_menu, screen_ai_difficulty as ui_screen_ai_difficulty, prompt_for_name as ui_prompt_for_name
+from audio import AudioDispatcher
+from fonts import get_font
+from startup import StartupProfiler
+from frameprof import FrameProfiler, PH_WAIT, PH_EVENTS, PH_SIM, PH_DRAW, PH_HUD, PH_PRESENT
+from pacing import FramePacer
+from textcache import render_text
+from replay import ReplayRecorder, replay_path
+from netplay import NetSession, NET_UP, NET_DOWN, NET_LAUNCH, host as net_host, join as net_join
+from engine import GameState, IN_LEFT_UP, IN_LEFT_DOWN, IN_RIGHT_UP, IN_RIGHT_DOWN, IN_LEFT_LAUNCH, IN_RIGHT_LAUNCH
+
+
+# pull constants from config
+WINDOW_WIDTH = cfg.WINDOW_WIDTH
+WINDOW_HEIGHT = cfg.WINDOW_HEIGHT
+FPS = cfg.FPS
+BLACK = cfg.BLACK
+WHITE = cfg.WHITE
+PADDLE_WIDTH = cfg.PADDLE_WIDTH
+PADDLE_HEIGHT = cfg.PADDLE_HEIGHT
+PADDLE_SPEED = cfg.PADDLE_SPEED
+BALL_RADIUS = cfg.BALL_RADIUS
+BALL_SPEED = cfg.BALL_SPEED
+MAX_BOUNCE_ANGLE_DEG = cfg.MAX_BOUNCE_ANGLE_DEG
+HITS_PER_SPEEDUP = cfg.HITS_PER_SPEEDUP
+SPEED_INCREMENT = cfg.SPEED_INCREMENT
+MAX_BALL_SPEED = cfg.MAX_BALL_SPEED
+WINNING_SCORE = cfg.WINNING_SCORE
+WIN_MESSAGE_DURATION_MS = cfg.WIN_MESSAGE_DURATION_MS
+
+# Player names (shown beside scores)
+LEFT_PLAYER_NAME = "Left"
+RIGHT_PLAYER_NAME = "Right"
+
+
+## Paddle and Ball classes are now in paddle.py and ball.py
+
+
+def read_inputs(keys: pygame.key.ScancodeWrapper, allow_right_human: bool, launch: bool) -> int:
+    """Translate keyboard state into an engine input bitmask."""
+    inputs = 0
+    if keys[pygame.K_w]:
+        inputs |= IN_LEFT_UP
+    if keys[pygame.K_s]:
+        inputs |= IN_LEFT_DOWN
+    if allow_right_human:
+        if keys[pygame.K_UP]:
+            inputs |= IN_RIGHT_UP
+        if keys[pygame.K_DOWN]:
+            inputs |= IN_RIGHT_DOWN
+    if launch:
+        inputs |= IN_LEFT_LAUNCH | IN_RIGHT_LAUNCH
+    return inputs
+
+
+def _choose_mode(window: pygame.Surface, title_font: pygame.font.Font, score_font: pygame.font.Font, ai_difficulty: str, on_first_frame=None) -> tuple[bool, str]:
+    """Run the main menu and name prompts; returns (opponent_is_ai, ai_difficulty)."""
+    mode = ui_show_main_menu(window, title_font, score_font, on_first_frame)
+    if mode == '1p':
+        globals()['LEFT_PLAYER_NAME'] = ui_prompt_for_name(window, "Enter Your Name:", LEFT_PLAYER_NAME, score_font)
+        globals()['RIGHT_PLAYER_NAME'] = "AI"
+        ai_difficulty = ui_screen_ai_difficulty(window, score_font, AI_LEVELS, initial=ai_difficulty)
+        return True, ai_difficulty
+    globals()['LEFT_PLAYER_NAME'] = ui_prompt_for_name(window, "Enter Left Player Name:", LEFT_PLAYER_NAME, score_font)
+    globals()['RIGHT_PLAYER_NAME'] = ui_prompt_for_name(window, "Enter Right Player Name:", RIGHT_PLAYER_NAME, score_font)
+    return False, ai_difficulty
+
+
+def _net_connect(args: argparse.Namespace, window: pygame.Surface, font: pygame.font.Font) -> NetSession | None:
+    """Host or join a netplay match, showing a waiting screen; None if cancelled or timed out."""
+    link_args = None
+    if args.net_latency or args.net_jitter or args.net_loss:
+        link_args = dict(latency_ms=args.net_latency, jitter_ms=args.net_jitter, loss=args.net_loss)
+    if args.host is not None:
+        message = f"Waiting for opponent on UDP port {args.host}... (Esc cancels)"
+    else:
+        message = f"Connecting to {args.join}... (Esc cancels)"
+    window.fill(BLACK)
+    draw_banner(window, message, font)
+    screen.present()
+
+    def cancelled() -> bool:
+        return any(event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE)
+                   for event in pygame.event.get())
+
+    if args.host is not None:
+        return net_host(args.host, WINDOW_WIDTH, WINDOW_HEIGHT, link_args=link_args, should_abort=cancelled)
+    return net_join(args.join, link_args=link_args, should_abort=cancelled)
+
+
+def run_netplay(args: argparse.Namespace) -> None:
+    """Online two-player match: each peer simulates locally and exchanges inputs over UDP."""
+    audio = AudioDispatcher(args.audio_buffer)
+    audio.start()
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption("Pong - Pygame (online)")
+    pacer = FramePacer(args.pacing, args.render_fps, args.spin_ms)
+    window = pacer.open_window((WINDOW_WIDTH, WINDOW_HEIGHT))
+    score_font = get_font("consolas", screen.scaled(40), bold=True)
+    winner_font = get_font("consolas", screen.scaled(72), bold=True)
+
+    session = _net_connect(args, window, score_font)
+    if session is None:
+        audio.stop()
+        pygame.quit()
+        return
+    state = session.state
+    if (state.width, state.height) != (WINDOW_WIDTH, WINDOW_HEIGHT):
+        # The host's playfield
+        window = pacer.open_window((state.width, state.height))
+        score_font = get_font("consolas", screen.scaled(40), bold=True)
+        winner_font = get_font("consolas", screen.scaled(72), bold=True)
+    left_name, right_name = ("You", "Opponent") if session.side == 'left' else ("Opponent", "You")
+
+    tick_ms = 1000.0 / cfg.TICK_RATE
+    accumulator_ms = 0.0
+    last_time = time.perf_counter()
+    launch = False
+    running = True
+    pacer.skip()
+    while running:
+        # Inputs must be sampled every tick, so netplay never idles in the event wait
+        pacer.wait()
+        now = time.perf_counter()
+        accumulator_ms += min((now - last_time) * 1000.0, tick_ms * cfg.MAX_TICKS_PER_FRAME)
+        last_time = now
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                launch = True
+
+        keys = pygame.key.get_pressed()
+        bits = NET_LAUNCH if launch else 0
+        if keys[pygame.K_w] or keys[pygame.K_UP]:
+            bits |= NET_UP
+        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+            bits |= NET_DOWN
+
+        session.poll()
+        lost = time.perf_counter() - session.last_heard > cfg.NET_TIMEOUT_S
+        while accumulator_ms >= tick_ms and not lost:
+            accumulator_ms -= tick_ms
+            if session.advance(bits):
+                launch = False
+                bits &= ~NET_LAUNCH
+                audio.post(state.events)
+
+        ui_draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score, left_name, right_name, score_font)
+        if lost:
+            draw_banner(window, "Connection lost (Esc to quit)", score_font)
+        elif session.finished:
+            message = "You win!" if state.winner == session.side else "You lose"
+            text = render_text(winner_font, message, True, WHITE)
+            window.blit(text, (window.get_width() // 2 - text.get_width() // 2, window.get_height() // 2 - text.get_height() // 2 - 40))
+        if session.desynced_at is not None:
+            draw_banner(window, f"Desync detected at frame {session.desynced_at}", score_font)
+        screen.present()
+
+    dropped = session.link.dropped if session.link else 0
+    print(f"netplay: {state.tick} ticks, {session.rollbacks} rollbacks ({session.rollback_frames} frames re-simulated), {dropped} packets dropped by shim")
+    if args.pacing_report:
+        print(pacer.stats.report(pacer.target_ms), file=sys.stderr)
+    session.close()
+    audio.stop()
+    pygame.quit()
+
+
+def run_multiball(args: argparse.Namespace) -> None:
+    """Multi-ball party mode: W/S and Up/Down, or the right side played by --multiball-ai."""
+    from multiball import MultiBallState  # NumPy is only needed for this mode
+
+    audio = AudioDispatcher(args.audio_buffer)
+    audio.start()
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption("Pong - Pygame (multi-ball)")
+    pacer = FramePacer(args.pacing, args.render_fps, args.spin_ms)
+    window = pacer.open_window((WINDOW_WIDTH, WINDOW_HEIGHT))
+    score_font = get_font("consolas", screen.scaled(40), bold=True)
+    winner_font = get_font("consolas", screen.scaled(72), bold=True)
+    state = MultiBallState(args.multiball, WINDOW_WIDTH, WINDOW_HEIGHT, right_ai=args.multiball_ai)
+    right_name = "AI" if args.multiball_ai else RIGHT_PLAYER_NAME
+    # Per-frame blit lists make many short-lived objects; with everything
+    # loaded so far moved out of the collector's view, full collections stay
+    # short instead of stalling a frame
+    gc.freeze()
+
+    tick_ms = 1000.0 / cfg.TICK_RATE
+    accumulator_ms = 0.0
+    last_time = time.perf_counter()
+    running = True
+    while running:
+        pacer.wait()
+        now = time.perf_counter()
+        accumulator_ms += min((now - last_time) * 1000.0, tick_ms * cfg.MAX_TICKS_PER_FRAME)
+        last_time = now
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and state.winner is not None:
+                state.reset_match()
+
+        keys = pygame.key.get_pressed()
+        inputs = 0
+        if keys[pygame.K_w]:
+            inputs |= IN_LEFT_UP
+        if keys[pygame.K_s]:
+            inputs |= IN_LEFT_DOWN
+        if keys[pygame.K_UP]:
+            inputs |= IN_RIGHT_UP
+        if keys[pygame.K_DOWN]:
+            inputs |= IN_RIGHT_DOWN
+        while accumulator_ms >= tick_ms:
+            accumulator_ms -= tick_ms
+            state.step(inputs, tick_ms)
+            audio.post(state.events)
+
+        xs, ys = state.ball_corners(min(1.0, accumulator_ms / tick_ms), screen.world_scale())
+        draw_multiball(window, state.left_paddle, state.right_paddle, xs, ys, screen.scaled(state.radius), state.left_score, state.right_score, LEFT_PLAYER_NAME, right_name, score_font)
+        if state.winner is not None:
+            winner_name = LEFT_PLAYER_NAME if state.winner == 'left' else right_name
+            text = render_text(winner_font, f"{winner_name} wins!", True, WHITE)
+            window.blit(text, (window.get_width() // 2 - text.get_width() // 2, window.get_height() // 2 - text.get_height() // 2 - 40))
+            draw_banner(window, "Enter plays again, Esc quits", score_font)
+        screen.present()
+
+    if args.pacing_report:
+        print(pacer.stats.report(pacer.target_ms), file=sys.stderr)
+    audio.stop()
+    pygame.quit()
+
+
+def run(args: argparse.Namespace, process_start: float) -> None:
+    """The windowed game: menus, the game loop and rounds, until the window is closed."""
+    profiler = StartupProfiler(args.profile_startup, start=process_start)
+    profiler.record("imports", time.perf_counter() - process_start)
+
+    # Only the subsystems the menu needs
+    # Mixer init and sound decoding run on the audio thread, off the first-frame path
+    with profiler.phase("audio start"):
+        audio = AudioDispatcher(args.audio_buffer)
+        audio.start()
+
+    # The title image decodes on a thread while SDL and the window come up;
+    # the menu waits for it only if it is not done by then
+    with profiler.phase("asset preload"):
+        assets.preload(images=(cfg.TITLE_IMAGE_PNG, cfg.TITLE_IMAGE_JPG), background=True)
+
+    with profiler.phase("sdl init"):
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_caption("Pong - Pygame")
+
+    # The fixed playfield is drawn onto a --render-size canvas, which is
+    # scaled to the window per --scaling; the menu fits the title image into it
+    with profiler.phase("window"):
+        pacer = FramePacer(args.pacing, args.render_fps, args.spin_ms)
+        window = pacer.open_window((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    with profiler.phase("fonts"):
+        score_font = get_font("consolas", screen.scaled(40), bold=True)
+        winner_font = get_font("consolas", screen.scaled(72), bold=True)
+        title_font = get_font("consolas", screen.scaled(72), bold=True)
+
+    game_over = False
+    winner_message = ""
+    restart_button_rect = None
+    menu_button_rect = None
+    winner_selected_idx = 0  # 0 restart, 1 menu
+    game_over_view = None  # last drawn (selection, hover) on the winner screen
+    ai_difficulty = "Medium"
+    changing_difficulty = False  # overlay state for changing AI difficulty in-game
+
+    # Menu flow
+    opponent_is_ai, ai_difficulty = _choose_mode(window, title_font, score_font, ai_difficulty, on_first_frame=profiler.first_frame)
+
+    # Random initial possession; Space launches for human, AI auto after delay
+    state = GameState(WINDOW_WIDTH, WINDOW_HEIGHT, right_ai=ai_difficulty if opponent_is_ai else None)
+    recorder = ReplayRecorder(replay_path(args.record, state.seed), state) if args.record else None
+
+    # Fixed-rate simulation; rendering interpolates between the last two ticks
+    tick_ms = 1000.0 / cfg.TICK_RATE
+    accumulator_ms = 0.0
+    last_time = time.perf_counter()
+    prev_positions = state.positions()
+    launch = False  # Space press waiting for the next tick
+    renderer = DirtyRenderer() if args.dirty_rects else None
+    # Always built in; costs a few no-op calls per frame until enabled by
+    # --frame-profile or F3
+    frame_profiler = FrameProfiler(enabled=bool(args.frame_profile), capacity=cfg.FRAME_PROFILE_FRAMES)
+    state.profiler = frame_profiler if frame_profiler.enabled else None
+    hud = None  # ProfilerHUD while the overlay is shown
+    pacing_hud = None  # PacingHUD while shown (F5)
+
+    running = True
+    pacer.skip()
+    while running:
+        frame_profiler.begin_frame()
+        pacer.wait()
+        frame_profiler.lap(PH_WAIT)
+        now = time.perf_counter()
+        frame_ms = (now - last_time) * 1000.0
+        last_time = now
+
+        keys = pygame.key.get_pressed()
+        back_to_menu = False
+
+        # Events; the game-over screen sleeps until there is input
+        events = wait_events(block=game_over and game_over_view is not None)
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                if hud:
+                    hud = None
+                    if not args.frame_profile:
+                        frame_profiler.disable()
+                else:
+                    hud = ProfilerHUD(frame_profiler, get_font("consolas", screen.scaled(16)), 1000.0 / (args.render_fps or cfg.TICK_RATE))
+                    frame_profiler.enable()
+                state.profiler = frame_profiler if frame_profiler.enabled else None
+                if renderer:
+                    renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                pacing_hud = None if pacing_hud else PacingHUD(pacer, get_font("consolas", screen.scaled(16)))
+                if renderer:
+                    renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                path = args.frame_profile or cfg.FRAME_PROFILE_PATH
+                frame_profiler.export(path)
+                print(f"frame profile written to {path}", file=sys.stderr)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and game_over:
+                # Restart or Back to Menu via button
+                if restart_button_rect and restart_button_rect.collidepoint(screen.to_canvas(event.pos)):
+                    state.reset_match()
+                    game_over = False
+                    if args.record:
+                        recorder = ReplayRecorder(replay_path(args.record, state.seed), state)
+                elif menu_button_rect and menu_button_rect.collidepoint(screen.to_canvas(event.pos)):
+                    back_to_menu = True
+            elif event.type == pygame.KEYDOWN:
+                if game_over:
+                    # Winner screen navigation with arrows, Enter confirms; Space disabled
+                    if event.key == pygame.K_LEFT:
+                        winner_selected_idx = 0
+                    elif event.key == pygame.K_RIGHT:
+                        winner_selected_idx = 1
+                    elif event.key == pygame.K_RETURN:
+                        if winner_selected_idx == 0:
+                            state.reset_match()
+                            game_over = False
+                            if args.record:
+                                recorder = ReplayRecorder(replay_path(args.record, state.seed), state)
+                        else:
+                            back_to_menu = True
+                    # Ignore other keys during game over
+                    continue
+                # Open AI difficulty change
+                if not changing_difficulty and event.key == pygame.K_2 and opponent_is_ai:
+                    changing_difficulty = True
+
+                # Launch from possession
+                if event.key == pygame.K_SPACE and state.held_by is not None:
+                    launch = True
+
+                # No rename during gameplay per request
+                # Handle AI difficulty overlay input
+                if changing_difficulty:
+                    picked = level_index_for_key(event.key, len(AI_LEVELS))
+                    if picked is not None:
+                        ai_difficulty = AI_LEVELS[picked]; changing_difficulty = False
+                    elif event.key in (pygame.K_LEFT,):
+                        idx = list(AI_LEVELS).index(ai_difficulty)
+                        ai_difficulty = AI_LEVELS[(idx - 1) % len(AI_LEVELS)]
+                    elif event.key in (pygame.K_RIGHT,):
+                        idx = list(AI_LEVELS).index(ai_difficulty)
+                        ai_difficulty = AI_LEVELS[(idx + 1) % len(AI_LEVELS)]
+                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE):
+                        changing_difficulty = False
+                    # reset AI reaction so difficulty takes effect instantly
+                    state.set_ai('right', ai_difficulty)
+                    if recorder:
+                        recorder.record_ai_change('right', ai_difficulty)
+        frame_profiler.lap(PH_EVENTS)
+
+        if not running:
+            break
+
+        if back_to_menu:
+            # Re-enter menu and configuration, then start a fresh match
+            game_over = False
+            opponent_is_ai, ai_difficulty = _choose_mode(window, title_font, score_font, ai_difficulty)
+            state.set_ai('right', ai_difficulty if opponent_is_ai else None)
+            state.reset_match()
+            if recorder:
+                recorder.close()
+            if args.record:
+                recorder = ReplayRecorder(replay_path(args.record, state.seed), state)
+            if renderer:
+                renderer.invalidate()
+            pacer.skip()
+            continue
+
+        if game_over or changing_difficulty:
+            # Paused: drop accumulated time so play resumes without a burst of ticks
+            # and keep the idle frames out of the frame-time statistics
+            accumulator_ms = 0.0
+            pacer.skip()
+            prev_positions = state.positions()
+            launch = False
+            last_time = time.perf_counter()
+            if renderer:
+                renderer.invalidate()
+
+        # Game over overlay
+        if game_over:
+            # Update selection from hover; redraw only when it changed
+            mp = screen.mouse_pos()
+            hover_restart = bool(restart_button_rect and restart_button_rect.collidepoint(mp))
+            hover_menu = bool(menu_button_rect and menu_button_rect.collidepoint(mp))
+            if hover_restart:
+                winner_selected_idx = 0
+            elif hover_menu:
+                winner_selected_idx = 1
+            view = (winner_selected_idx, hover_restart, hover_menu)
+            if view != game_over_view or was_exposed(events):
+                game_over_view = view
+                ui_draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score, LEFT_PLAYER_NAME, RIGHT_PLAYER_NAME, score_font)
+                restart_button_rect, menu_button_rect = ui_draw_winner(window, winner_message, winner_font, score_font, winner_selected_idx, mp)
+                screen.present()
+            continue
+
+        # Rename overlay removed
+
+        # AI Difficulty overlay (pauses gameplay)
+        if changing_difficulty:
+            ui_draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score, LEFT_PLAYER_NAME, RIGHT_PLAYER_NAME, score_font)
+            line1 = render_text(score_font, "AI Difficulty:", True, WHITE)
+            line2 = render_text(score_font, f"< {ai_difficulty} >", True, WHITE)
+            line3 = render_text(score_font, f"1-{min(len(AI_LEVELS), 9)} or ←/→, Enter/Esc to close", True, WHITE)
+            total_h = line1.get_height() + line2.get_height() + line3.get_height() + 24
+            bg_rect = pygame.Rect(0, 0, max(line1.get_width(), line2.get_width(), line3.get_width()) + 40, total_h)
+            bg_rect.center = window.get_rect().center
+            pygame.draw.rect(window, (20, 20, 20), bg_rect)
+            pygame.draw.rect(window, WHITE, bg_rect, 2)
+            y = bg_rect.y + 8
+            window.blit(line1, (bg_rect.x + (bg_rect.w - line1.get_width()) // 2, y)); y += line1.get_height() + 4
+            window.blit(line2, (bg_rect.x + (bg_rect.w - line2.get_width()) // 2, y)); y += line2.get_height() + 4
+            window.blit(line3, (bg_rect.x + (bg_rect.w - line3.get_width()) // 2, y))
+            screen.present()
+            continue
+
+        # Gameplay update: run as many fixed ticks as the elapsed time covers
+        accumulator_ms += min(frame_ms, tick_ms * cfg.MAX_TICKS_PER_FRAME)
+        while accumulator_ms >= tick_ms:
+            accumulator_ms -= tick_ms
+            prev_positions = state.positions()
+            inputs = read_inputs(keys, not opponent_is_ai, launch)
+            if recorder:
+                recorder.record(inputs)
+            state.step(inputs, tick_ms)
+            launch = False
+            audio.post(state.events)
+            if "score" in state.events:
+                # Ball was teleported to the holder; don't interpolate across it
+                prev_positions = state.positions()
+            frame_profiler.lap(PH_SIM)
+
+            # Check for winner
+            if state.winner is not None:
+                winner_name = LEFT_PLAYER_NAME if state.winner == 'left' else RIGHT_PLAYER_NAME
+                winner_message = f"{winner_name} wins!"
+                game_over = True
+                game_over_view = None
+                if recorder:
+                    recorder.finish(state)
+                break
+
+        alpha = min(1.0, accumulator_ms / tick_ms)
+        if renderer:
+            if hud or pacing_hud:
+                # The overlays cover part of the playfield; repaint in full
+                renderer.invalidate()
+            dirty = renderer.draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score, LEFT_PLAYER_NAME, RIGHT_PLAYER_NAME, score_font, prev_positions, alpha)
+        else:
+            ui_draw(window, state.left_paddle, state.right_paddle, state.ball, state.left_score, state.right_score, LEFT_PLAYER_NAME, RIGHT_PLAYER_NAME, score_font, prev_positions, alpha)
+        frame_profiler.lap(PH_DRAW)
+        if hud:
+            hud.draw(window)
+        if pacing_hud:
+            pacing_hud.draw(window)
+        if hud or pacing_hud:
+            frame_profiler.lap(PH_HUD)
+        if renderer:
+            screen.present(dirty)
+        else:
+            screen.present()
+        frame_profiler.lap(PH_PRESENT)
+
+    audio.stop()
+    if recorder:
+        recorder.close()
+    if args.frame_profile:
+        frame_profiler.export(args.frame_profile)
+        print(frame_profiler.report(), file=sys.stderr)
+        print(f"frame profile written to {args.frame_profile}", file=sys.stderr)
+    if args.pacing_report:
+        print(pacer.stats.report(pacer.target_ms), file=sys.stderr)
+    if args.asset_times:
+        print(assets.report())
+    pygame.quit()
+    sys.exit(0)
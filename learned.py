@@ -0,0 +1,248 @@
+import argparse
+import os
+import time
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+import config as cfg
+from batch import ACTION_DOWN, ACTION_STAY, ACTION_UP, BatchPong
+
+
+# Policy inputs, all in the right paddle's frame (the ball approaches with
+# vel_x > 0) and roughly in [-1, 1]
+N_FEATURES = 6
+# Policy outputs, in the order of batch.ACTION_*
+N_ACTIONS = 3
+assert (ACTION_STAY, ACTION_UP, ACTION_DOWN) == (0, 1, 2)
+
+
+def features(paddle_x: float, paddle_center: float, ball_x: float, ball_y: float,
+             vel_x: float, vel_y: float, width: int, height: int) -> tuple:
+    return ((paddle_x - ball_x) / width, ball_y / height - 0.5,
+            vel_x / cfg.MAX_BALL_SPEED, vel_y / cfg.MAX_BALL_SPEED,
+            paddle_center / height - 0.5, (ball_y - paddle_center) / height)
+
+
+class MLPPolicy:
+    """One-hidden-layer tanh MLP mapping features() to an action; NumPy only."""
+    __slots__ = ("w1", "b1", "w2", "b2", "_x")
+
+    def __init__(self, w1: np.ndarray, b1: np.ndarray, w2: np.ndarray, b2: np.ndarray) -> None:
+        self.w1 = np.ascontiguousarray(w1, dtype=np.float32)
+        self.b1 = np.ascontiguousarray(b1, dtype=np.float32)
+        self.w2 = np.ascontiguousarray(w2, dtype=np.float32)
+        self.b2 = np.ascontiguousarray(b2, dtype=np.float32)
+        self._x = np.zeros(N_FEATURES, dtype=np.float32)
+
+    @classmethod
+    def load(cls, path: str) -> "MLPPolicy":
+        with np.load(path) as data:
+            return cls(data["w1"], data["b1"], data["w2"], data["b2"])
+
+    def save(self, path: str) -> None:
+        # float16 halves the file; the policy is insensitive at that precision
+        np.savez_compressed(path, w1=self.w1.astype(np.float16), b1=self.b1.astype(np.float16),
+                            w2=self.w2.astype(np.float16), b2=self.b2.astype(np.float16))
+
+    def act(self, x: Sequence[float]) -> int:
+        """Action for one feature vector; the per-frame path of the learned AI level."""
+        buf = self._x
+        buf[:] = x
+        hidden = np.tanh(buf @ self.w1 + self.b1)
+        return int((hidden @ self.w2 + self.b2).argmax())
+
+    def decide(self, paddle: Any, ball: Any, width: int, height: int) -> int:
+        """act() on a Paddle and Ball seen from the right side of the field."""
+        return self.act(features(paddle.x, paddle.y + paddle.height / 2, ball.x, ball.y,
+                                 ball.vel_x, ball.vel_y, width, height))
+
+    def act_batch(self, x: np.ndarray) -> np.ndarray:
+        hidden = np.tanh(x @ self.w1 + self.b1)
+        return (hidden @ self.w2 + self.b2).argmax(axis=-1)
+
+
+_policies: dict[str, MLPPolicy] = {}
+
+
+def get_policy(path: str) -> MLPPolicy:
+    """Load a weights file once per process."""
+    policy = _policies.get(path)
+    if policy is None:
+        policy = _policies[path] = MLPPolicy.load(path)
+    return policy
+
+
+# -- training -----------------------------------------------------------------
+def _shapes(hidden: int) -> list[tuple[int, ...]]:
+    return [(N_FEATURES, hidden), (hidden,), (hidden, N_ACTIONS), (N_ACTIONS,)]
+
+
+def _unflatten(theta: np.ndarray, hidden: int) -> list[np.ndarray]:
+    """Split (..., n_params) into per-layer arrays with the same leading dims."""
+    parts = []
+    offset = 0
+    for shape in _shapes(hidden):
+        size = int(np.prod(shape))
+        parts.append(theta[..., offset:offset + size].reshape(theta.shape[:-1] + shape))
+        offset += size
+    return parts
+
+
+def _batch_features(env: BatchPong) -> np.ndarray:
+    """features() for the left paddle of every match, mirrored into the right paddle's frame."""
+    w, h = env.width, env.height
+    center = env.ly + env.ph / 2
+    return np.stack(((env.right_x - (w - env.bx)) / w, env.by / h - 0.5,
+                     -env.vx / cfg.MAX_BALL_SPEED, env.vy / cfg.MAX_BALL_SPEED,
+                     center / h - 0.5, (env.by - center) / h), axis=1).astype(np.float32)
+
+
+def _evaluate(thetas: np.ndarray, hidden: int, envs: list[BatchPong], steps: int, seed: int,
+              hit_bonus: float) -> np.ndarray:
+    """Total shaped reward per parameter vector, each playing its own block of matches."""
+    pop = thetas.shape[0]
+    w1, b1, w2, b2 = (p.astype(np.float32) for p in _unflatten(thetas, hidden))
+    fitness = np.zeros(pop)
+    for env in envs:
+        per = env.n // pop
+        env.reset(seed)
+        for _ in range(steps):
+            x = _batch_features(env).reshape(pop, per, N_FEATURES)
+            hid = np.tanh(x @ w1 + b1[:, None, :])
+            actions = (hid @ w2 + b2[:, None, :]).argmax(axis=-1).reshape(-1)
+            prev_vx = env.vx
+            _, rewards, _, _ = env.step(actions)
+            # Returning the ball is rewarded too, so early generations get a signal
+            returned = (prev_vx < 0) & (env.vx > 0) & (env.bx < env.width / 2)
+            fitness += (rewards + hit_bonus * returned).reshape(pop, per).sum(axis=1)
+    return fitness
+
+
+def train(generations: int = 150, population: int = 32, matches: int = 8, steps: int = 2000,
+          hidden: int = 16, sigma: float = 0.1, lr: float = 0.05, hit_bonus: float = 0.2,
+          opponents: Sequence[str] = ("Medium", "Hard"), seed: int = 0, init: Optional[str] = None,
+          log: Optional[callable] = print) -> MLPPolicy:
+    """Evolution strategies against the scripted AI levels in BatchPong.
+
+    Each generation samples population/2 antithetic perturbations, plays
+    every perturbed policy for steps frames in `matches` parallel matches
+    against each opponent (same seeds for all, to cut variance), and moves
+    the weights along the rank-weighted perturbations with Adam. With init,
+    training continues from that weights file (whose hidden size wins).
+    """
+    rng = np.random.default_rng(seed)
+    population -= population % 2
+    half = population // 2
+    if init:
+        start_policy = MLPPolicy.load(init)
+        hidden = start_policy.b1.shape[0]
+        theta = np.concatenate([p.ravel() for p in (start_policy.w1, start_policy.b1, start_policy.w2, start_policy.b2)]).astype(np.float64)
+        n_params = theta.size
+    else:
+        n_params = sum(int(np.prod(s)) for s in _shapes(hidden))
+        theta = np.zeros(n_params)
+        theta[:N_FEATURES * hidden] = rng.standard_normal(N_FEATURES * hidden) / np.sqrt(N_FEATURES)
+    m = np.zeros(n_params)
+    v = np.zeros(n_params)
+    envs = [BatchPong(population * matches, left_ai=None, right_ai=level, seed=seed) for level in opponents]
+    ranks = np.arange(population) / (population - 1) - 0.5
+
+    start = time.perf_counter()
+    for gen in range(1, generations + 1):
+        eps = rng.standard_normal((half, n_params))
+        thetas = np.concatenate((theta + sigma * eps, theta - sigma * eps))
+        fitness = _evaluate(thetas, hidden, envs, steps, seed * 100_003 + gen, hit_bonus)
+        shaped = np.empty(population)
+        shaped[fitness.argsort()] = ranks
+        grad = (shaped[:half] - shaped[half:]) @ eps / (half * sigma)
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad * grad
+        theta += lr * (m / (1 - 0.9 ** gen)) / (np.sqrt(v / (1 - 0.999 ** gen)) + 1e-8)
+        if log:
+            per_match = fitness / (matches * len(envs))
+            log(f"gen {gen:4d}  reward/match mean {per_match.mean():+.2f} best {per_match.max():+.2f}"
+                f"  {time.perf_counter() - start:.0f}s")
+    return MLPPolicy(*_unflatten(theta, hidden))
+
+
+# -- evaluation ---------------------------------------------------------------
+def evaluate(path: str, matches: int = 40, seed: int = 0, workers: Optional[int] = None) -> dict:
+    """tournament.py round robin of the learned level (playing `path`) against the scripted levels."""
+    from dataclasses import replace
+    from ai import AIM_LEARNED, PROFILES, AIProfile
+    from tournament import run_tournament
+    profiles = {name: p for name, p in PROFILES.items() if p.aim != AIM_LEARNED}
+    learned = next((p for p in PROFILES.values() if p.aim == AIM_LEARNED), None)
+    learned = learned or AIProfile("Learned", 1.0, 2, 0, False, AIM_LEARNED)
+    profiles[learned.name] = replace(learned, weights=os.path.abspath(path))
+    return run_tournament(matches, seed, profiles, workers=workers)
+
+
+# -- benchmark ----------------------------------------------------------------
+def bench(path: str, calls: int = 100_000) -> float:
+    """Mean microseconds per single-frame decision, feature extraction included."""
+    policy = MLPPolicy.load(path)
+    rng = np.random.default_rng(0)
+    w, h = cfg.WINDOW_WIDTH, cfg.WINDOW_HEIGHT
+    samples = [(w - 60.0, float(rng.uniform(0, h)), float(rng.uniform(0, w)), float(rng.uniform(0, h)),
+                float(rng.uniform(-12, 12)), float(rng.uniform(-8, 8))) for _ in range(1024)]
+    act = policy.act
+    for s in samples:
+        act(features(*s, w, h))
+    start = time.perf_counter()
+    for i in range(calls):
+        act(features(*samples[i & 1023], w, h))
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train, evaluate or benchmark the learned AI level")
+    sub = parser.add_subparsers(dest="command", required=True)
+    t = sub.add_parser("train", help="train a policy against the scripted levels (CPU only)")
+    t.add_argument("--out", default=cfg.LEARNED_AI_WEIGHTS)
+    t.add_argument("--generations", type=int, default=150)
+    t.add_argument("--population", type=int, default=32)
+    t.add_argument("--matches", type=int, default=8, help="parallel matches per policy and opponent")
+    t.add_argument("--steps", type=int, default=2000, help="frames per evaluation")
+    t.add_argument("--hidden", type=int, default=16)
+    t.add_argument("--opponents", default="Medium,Hard")
+    t.add_argument("--seed", type=int, default=0)
+    t.add_argument("--init", metavar="WEIGHTS", help="continue training from this weights file")
+    e = sub.add_parser("eval", help="play the weights against the scripted levels with tournament.py")
+    e.add_argument("--weights", default=cfg.LEARNED_AI_WEIGHTS)
+    e.add_argument("--matches", type=int, default=40, help="matches per ordered pairing")
+    e.add_argument("--seed", type=int, default=0)
+    e.add_argument("--workers", type=int, default=None)
+    e.add_argument("--floor", default="Medium", help="fail unless the learned level's overall win rate is at least this level's")
+    b = sub.add_parser("bench", help="time per-frame inference")
+    b.add_argument("--weights", default=cfg.LEARNED_AI_WEIGHTS)
+    b.add_argument("--calls", type=int, default=100_000)
+    b.add_argument("--budget-us", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        policy = train(args.generations, args.population, args.matches, args.steps, args.hidden,
+                       opponents=args.opponents.split(","), seed=args.seed, init=args.init)
+        policy.save(args.out)
+        print(f"weights written to {args.out}")
+    elif args.command == "eval":
+        from tournament import format_report
+        summary = evaluate(args.weights, args.matches, args.seed, args.workers)
+        print(format_report(summary))
+        rates = summary["levels"]
+        name = list(rates)[-1]
+        ok = (rates[name] or 0.0) >= (rates[args.floor] or 0.0)
+        print(f"{name} {'matches or beats' if ok else 'is WEAKER than'} {args.floor}")
+        if not ok:
+            raise SystemExit(1)
+    else:
+        us = bench(args.weights, args.calls)
+        verdict = "within" if us <= args.budget_us else "OVER"
+        print(f"{us:.2f} us per decision ({verdict} the {args.budget_us:g} us budget)")
+        if us > args.budget_us:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+import argparse
+import gc
+import math
+import os
+import random
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+import config as cfg
+from ai import AIProfile, AIState, move_ai_paddle, PROFILES
+from ball import Ball
+from engine import IN_LEFT_UP, IN_LEFT_DOWN, IN_RIGHT_UP, IN_RIGHT_DOWN, PADDLE_MARGIN
+from paddle import Paddle
+
+
+# Ball-ball contacts only turn a ball, they never stop it: after a contact
+# its horizontal speed is kept at least this fraction of its speed
+MIN_VX_FRACTION = 0.35
+
+
+class SpatialHash:
+    """Uniform grid over the playfield, rebuilt from scratch every tick.
+
+    With cells at least one ball diameter wide, two touching balls are always
+    in the same or neighbouring cells, so candidate pairs come from each
+    ball's cell and four of its neighbours (each neighbouring pair of cells
+    is visited once) instead of from all n * (n - 1) / 2 pairs.
+    """
+
+    # Same cell, then east, south-west, south and south-east
+    NEIGHBOURS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, width: int, height: int, cell: float) -> None:
+        self.cell = cell
+        self.cols = max(1, math.ceil(width / cell))
+        self.rows = max(1, math.ceil(height / cell))
+
+    def pairs(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Index arrays (i, j) of every candidate pair, i != j, each pair once."""
+        cols, rows = self.cols, self.rows
+        cx = np.clip((x / self.cell).astype(np.int64), 0, cols - 1)
+        cy = np.clip((y / self.cell).astype(np.int64), 0, rows - 1)
+        key = cy * cols + cx
+        order = np.argsort(key, kind="stable")
+        counts = np.bincount(key, minlength=cols * rows)
+        starts = np.cumsum(counts) - counts
+
+        firsts, seconds = [], []
+        for dx, dy in self.NEIGHBOURS:
+            nx = cx + dx
+            ny = cy + dy
+            valid = (nx >= 0) & (nx < cols) & (ny < rows)
+            i = np.flatnonzero(valid)
+            neighbour = ny[i] * cols + nx[i]
+            per_ball = counts[neighbour]
+            total = int(per_ball.sum())
+            if not total:
+                continue
+            # Expand every ball i into one entry per ball of its neighbouring cell
+            firsts_i = np.repeat(i, per_ball)
+            offsets = np.arange(total) - np.repeat(np.cumsum(per_ball) - per_ball, per_ball)
+            seconds_i = order[np.repeat(starts[neighbour], per_ball) + offsets]
+            if dx == 0 and dy == 0:
+                keep = firsts_i < seconds_i
+                firsts_i, seconds_i = firsts_i[keep], seconds_i[keep]
+            firsts.append(firsts_i)
+            seconds.append(seconds_i)
+        if not firsts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+
+class MultiBallState:
+    """Display-free party mode: n balls in play at once, colliding with each other.
+
+    The counterpart of engine.GameState for many balls. Balls live in NumPy
+    arrays (x, y, vel_x, vel_y, speed, rally hits); every ball that leaves
+    the field scores for the other side and is served again from the centre.
+    Paddles, inputs, AI levels and events work as in GameState, except that
+    there is no possession: balls are always in play. Each AI tracks the ball
+    that will reach its paddle first.
+    """
+
+    def __init__(self, balls: int, width: int = cfg.WINDOW_WIDTH, height: int = cfg.WINDOW_HEIGHT,
+                 left_ai: Optional[str] = None, right_ai: Optional[str] = None,
+                 seed: Optional[int] = None, radius: int = cfg.MULTIBALL_RADIUS,
+                 profiles: Dict[str, AIProfile] = PROFILES) -> None:
+        self.n = balls
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.profiles = profiles
+        self.max_angle = math.radians(cfg.MAX_BOUNCE_ANGLE_DEG)
+        self.grid = SpatialHash(width, height, 2 * radius)
+
+        self.left_paddle = Paddle(PADDLE_MARGIN, height // 2 - cfg.PADDLE_HEIGHT // 2, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+        self.right_paddle = Paddle(width - PADDLE_MARGIN - cfg.PADDLE_WIDTH, height // 2 - cfg.PADDLE_HEIGHT // 2, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+        # Stand-ins handed to ai.move_ai_paddle: the tracked ball, and the
+        # mirrored ball and paddle for the left side
+        self._target = Ball(0, 0, radius, 0, 0)
+        self._mirror_paddle = Paddle(width - PADDLE_MARGIN - cfg.PADDLE_WIDTH, 0, cfg.PADDLE_WIDTH, cfg.PADDLE_HEIGHT, cfg.PADDLE_SPEED)
+
+        self.x = np.zeros(balls)
+        self.y = np.zeros(balls)
+        self.vel_x = np.zeros(balls)
+        self.vel_y = np.zeros(balls)
+        self.speed = np.zeros(balls)
+        self.hits = np.zeros(balls, dtype=np.int64)
+        # Positions at the start of the last tick, for render interpolation
+        self.prev_x = np.zeros(balls)
+        self.prev_y = np.zeros(balls)
+
+        self.events: list[str] = []
+        self.left_ai = left_ai
+        self.right_ai = right_ai
+        self.left_ai_state = AIState(profiles[left_ai], cfg.PADDLE_SPEED, width) if left_ai else None
+        self.right_ai_state = AIState(profiles[right_ai], cfg.PADDLE_SPEED, width) if right_ai else None
+        self.reset_match(seed)
+
+    def reset_match(self, seed: Optional[int] = None) -> None:
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = np.random.default_rng(self.seed)
+        self.ai_rng = random.Random(self.seed)
+        self.left_score = 0
+        self.right_score = 0
+        self.winner: Optional[str] = None
+        self.tick = 0
+        for ai_state in (self.left_ai_state, self.right_ai_state):
+            if ai_state:
+                ai_state.reset()
+        self.left_paddle.y = self.height // 2 - cfg.PADDLE_HEIGHT // 2
+        self.right_paddle.y = self.height // 2 - cfg.PADDLE_HEIGHT // 2
+        # Spread the opening serve over the middle half of the field
+        self._serve(np.arange(self.n), self.rng.uniform(self.width * 0.25, self.width * 0.75, self.n))
+
+    def _serve(self, idx: np.ndarray, x: Optional[np.ndarray] = None) -> None:
+        """Restart balls idx at serve speed from the centre line, or from x (one value per ball in idx)."""
+        count = idx.size
+        self.x[idx] = self.width / 2 if x is None else x
+        self.y[idx] = self.rng.uniform(self.radius, self.height - self.radius, count)
+        self.prev_x[idx] = self.x[idx]
+        self.prev_y[idx] = self.y[idx]
+        angle = self.rng.uniform(-self.max_angle, self.max_angle, count) / 2
+        direction = np.where(self.rng.random(count) < 0.5, -1.0, 1.0)
+        speed = cfg.BALL_SPEED * self.rng.uniform(0.7, 1.0, count)
+        self.speed[idx] = speed
+        self.vel_x[idx] = direction * speed * np.cos(angle)
+        self.vel_y[idx] = speed * np.sin(angle)
+        self.hits[idx] = 0
+
+    # -- AI -----------------------------------------------------------------
+    def _track(self, side: str) -> None:
+        """Point the AI's target ball at the one reaching side's paddle soonest."""
+        target = self._target
+        sign = 1.0 if side == 'right' else -1.0
+        face_x = self.right_paddle.x if side == 'right' else self._mirror_paddle.x
+        x = self.x if side == 'right' else self.width - self.x
+        vx = self.vel_x * sign
+        # Balls already past the paddle are lost causes
+        approaching = (vx > 0) & (x <= face_x)
+        if approaching.any():
+            eta = np.where(approaching, (face_x - x) / np.where(approaching, vx, 1.0), np.inf)
+            i = int(eta.argmin())
+        else:
+            i = int(np.abs(x - face_x).argmin())
+        target.x = float(x[i])
+        target.y = float(self.y[i])
+        target.vel_x = float(vx[i])
+        target.vel_y = float(self.vel_y[i])
+
+    def _move_ai(self) -> None:
+        if self.right_ai_state:
+            self._track('right')
+            move_ai_paddle(self.right_paddle, self._target, self.right_ai_state, self.height, self.ai_rng)
+        if self.left_ai_state:
+            self._track('left')
+            mp = self._mirror_paddle
+            mp.y = self.left_paddle.y
+            move_ai_paddle(mp, self._target, self.left_ai_state, self.height, self.ai_rng)
+            self.left_paddle.y = mp.y
+
+    # -- physics ------------------------------------------------------------
+    def _paddle_contacts(self, paddle: Paddle, direction: int) -> np.ndarray:
+        """Bounce balls off one paddle; returns the indices that hit it.
+
+        Same rules as physics.handle_collision: the paddle face is swept over
+        the last tick's motion, with the circle-vs-rect overlap test as the
+        fallback for a paddle moving onto a ball.
+        """
+        x, y, vx, vy, r = self.x, self.y, self.vel_x, self.vel_y, self.radius
+        x0 = x - vx
+        y0 = y - vy
+        if direction > 0:
+            face = paddle.x + paddle.width + r
+            toward = vx < 0
+            crossed = toward & (x0 >= face) & (x < face)
+        else:
+            face = paddle.x - r
+            toward = vx > 0
+            crossed = toward & (x0 <= face) & (x > face)
+        if not toward.any():
+            return np.empty(0, dtype=np.int64)
+        t = (face - x0) / np.where(vx != 0, vx, 1.0)
+        y_cross = y0 + vy * t
+        top = paddle.y
+        bottom = top + paddle.height
+        swept = crossed & (y_cross >= top - r) & (y_cross <= bottom + r)
+        dx = np.maximum(np.maximum(paddle.x - x, x - (paddle.x + paddle.width)), 0.0)
+        dy = np.maximum(np.maximum(top - y, y - bottom), 0.0)
+        hit = swept | (toward & (dx * dx + dy * dy < r * r))
+        idx = np.flatnonzero(hit)
+        if not idx.size:
+            return idx
+
+        was_swept = swept[idx]
+        y_hit = np.where(was_swept, y_cross[idx], y[idx])
+        remaining = np.where(was_swept, 1.0 - t[idx], 0.0)
+        self.hits[idx] += 1
+        speed = self.speed[idx]
+        speed = np.where(self.hits[idx] % cfg.HITS_PER_SPEEDUP == 0,
+                         np.minimum(cfg.MAX_BALL_SPEED, speed + cfg.SPEED_INCREMENT), speed)
+        self.speed[idx] = speed
+        half = paddle.height / 2
+        angle = np.clip((y_hit - (top + half)) / half, -1.0, 1.0) * self.max_angle
+        vx[idx] = direction * speed * np.cos(angle)
+        vy[idx] = speed * np.sin(angle)
+        x[idx] = face + vx[idx] * remaining
+        y[idx] = y_hit + vy[idx] * remaining
+        return idx
+
+    def _walls(self) -> bool:
+        y, vy, r, h = self.y, self.vel_y, self.radius, self.height
+        top = y - r <= 0
+        bottom = y + r >= h
+        if not (top.any() or bottom.any()):
+            return False
+        y[top] = 2 * r - y[top]
+        vy[top] = np.abs(vy[top])
+        y[bottom] = 2 * (h - r) - y[bottom]
+        vy[bottom] = -np.abs(vy[bottom])
+        return True
+
+    def _collide_balls(self) -> bool:
+        """Elastic contacts between equal balls, candidates from the spatial hash."""
+        x, y, vx, vy = self.x, self.y, self.vel_x, self.vel_y
+        i, j = self.grid.pairs(x, y)
+        if not i.size:
+            return False
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        dist2 = dx * dx + dy * dy
+        diameter = 2 * self.radius
+        touching = (dist2 < diameter * diameter) & (dist2 > 0)
+        if not touching.any():
+            return False
+        i, j, dx, dy = i[touching], j[touching], dx[touching], dy[touching]
+        dist = np.sqrt(dist2[touching])
+        nx = dx / dist
+        ny = dy / dist
+        # Equal masses swap their velocity components along the contact
+        # normal; only pairs moving towards each other exchange momentum
+        closing = np.minimum((vx[j] - vx[i]) * nx + (vy[j] - vy[i]) * ny, 0.0)
+        # Overlap is split evenly so the pair ends up just touching
+        push = (diameter - dist) / 2
+        n = self.n
+        vx += np.bincount(i, closing * nx, n) - np.bincount(j, closing * nx, n)
+        vy += np.bincount(i, closing * ny, n) - np.bincount(j, closing * ny, n)
+        x += np.bincount(j, push * nx, n) - np.bincount(i, push * nx, n)
+        y += np.bincount(j, push * ny, n) - np.bincount(i, push * ny, n)
+
+        # Each ball keeps its own speed; contacts only change its heading
+        moved = np.unique(np.concatenate((i, j)))
+        speed = self.speed[moved]
+        mvx, mvy = vx[moved], vy[moved]
+        min_vx = speed * MIN_VX_FRACTION
+        mvx = np.where(mvx < 0, -1.0, 1.0) * np.maximum(np.abs(mvx), min_vx)
+        mvx = np.clip(mvx, -speed, speed)
+        vx[moved] = mvx
+        vy[moved] = np.where(mvy < 0, -1.0, 1.0) * np.sqrt(np.maximum(speed * speed - mvx * mvx, 0.0))
+        return True
+
+    def step(self, inputs: int, dt_ms: float) -> None:
+        """Advance the match by one frame using the given input bitmask (launch bits are ignored)."""
+        self.events.clear()
+        if self.winner is not None:
+            return
+        self.tick += 1
+        left, right = self.left_paddle, self.right_paddle
+
+        if not self.left_ai:
+            if inputs & IN_LEFT_UP:
+                left.move_up(self.height)
+            if inputs & IN_LEFT_DOWN:
+                left.move_down(self.height)
+        if not self.right_ai:
+            if inputs & IN_RIGHT_UP:
+                right.move_up(self.height)
+            if inputs & IN_RIGHT_DOWN:
+                right.move_down(self.height)
+        self._move_ai()
+
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        hit = self._paddle_contacts(left, 1).size + self._paddle_contacts(right, -1).size
+        if hit:
+            self.events.append("hit")
+        if self._walls():
+            self.events.append("wall")
+        self._collide_balls()
+
+        # Scoring: one event per tick however many balls went out
+        r = self.radius
+        out_left = self.x + r < 0
+        out_right = self.x - r > self.width
+        scored = np.flatnonzero(out_left | out_right)
+        if not scored.size:
+            return
+        self.right_score += int(out_left.sum())
+        self.left_score += int(out_right.sum())
+        self._serve(scored)
+        self.events.append("score")
+        target = cfg.MULTIBALL_WINNING_SCORE
+        if self.left_score >= target or self.right_score >= target:
+            self.winner = 'left' if self.left_score > self.right_score else 'right'
+            self.events.append("win")
+
+    def ball_corners(self, alpha: float = 1.0, scale: float = 1.0) -> tuple[list[int], list[int]]:
+        """Top-left pixel of every ball's sprite, interpolated by alpha from the
+        previous tick, on a canvas of `scale` pixels per unit (sprite radius
+        max(1, round(radius * scale)))."""
+        if alpha >= 1.0:
+            x, y = self.x, self.y
+        else:
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+        r = self.radius
+        if scale != 1.0:
+            x, y = x * scale, y * scale
+            r = max(1, round(r * scale))
+        return (x - r).astype(np.int32).tolist(), (y - r).astype(np.int32).tolist()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark multi-ball mode")
+    parser.add_argument("--balls", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--left-ai", default="Hard")
+    parser.add_argument("--right-ai", default="Hard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="store_true",
+                        help="also draw every tick (SDL dummy video driver unless SDL_VIDEODRIVER is set)")
+    args = parser.parse_args(argv)
+
+    state = MultiBallState(args.balls, left_ai=args.left_ai, right_ai=args.right_ai, seed=args.seed)
+    window = font = None
+    if args.render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        import ui
+        pygame.display.init()
+        pygame.font.init()
+        window = pygame.display.set_mode((state.width, state.height))
+        font = pygame.font.Font(None, 40)
+
+    dt_ms = 1000.0 / cfg.TICK_RATE
+    frame_ms = []
+    gc.freeze()  # as main.run_multiball does
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        state.step(0, dt_ms)
+        if window is not None:
+            xs, ys = state.ball_corners(0.5)
+            ui.draw_multiball(window, state.left_paddle, state.right_paddle, xs, ys, state.radius,
+                              state.left_score, state.right_score, "Left", "Right", font)
+        frame_ms.append((time.perf_counter() - start) * 1000.0)
+        if state.winner is not None:
+            state.reset_match()
+    frame_ms.sort()
+    budget_ms = 1000.0 / cfg.TICK_RATE
+    p99 = frame_ms[int(len(frame_ms) * 0.99)]
+    what = "tick + draw" if window is not None else "tick"
+    print(f"{args.balls} balls, {args.ticks} ticks: {what} mean {sum(frame_ms) / len(frame_ms):.2f} ms"
+          f"  p50 {frame_ms[len(frame_ms) // 2]:.2f} ms  p99 {p99:.2f} ms"
+          f"  ({'within' if p99 <= budget_ms else 'OVER'} the {budget_ms:.1f} ms budget at {cfg.TICK_RATE} Hz)")
+
+
+if __name__ == "__main__":
+    main()
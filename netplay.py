@@ -0,0 +1,345 @@
+import heapq
+import random
+import socket
+import struct
+import time
+from typing import Optional
+
+import config as cfg
+from engine import GameState, IN_LEFT_UP, IN_LEFT_DOWN, IN_RIGHT_UP, IN_RIGHT_DOWN, IN_LEFT_LAUNCH, IN_RIGHT_LAUNCH
+
+
+# Side-neutral input bits exchanged between peers; each peer maps its own
+# bits onto its side of the engine bitmask
+NET_UP = 1
+NET_DOWN = 2
+NET_LAUNCH = 4
+_SIDE_BITS = {
+    'left': (IN_LEFT_UP, IN_LEFT_DOWN, IN_LEFT_LAUNCH),
+    'right': (IN_RIGHT_UP, IN_RIGHT_DOWN, IN_RIGHT_LAUNCH),
+}
+
+# Packets: one type byte, then
+#   HELLO:   nothing (joiner -> host, repeated until WELCOME arrives)
+#   WELCOME: seed, width, height (host -> joiner)
+#   INPUT:   sender's current frame, highest frame of ours the sender has,
+#            sender's frame advantage, first frame, count, then count input bytes
+#   SYNC:    frame, GameState.checksum() at that frame, for desync detection
+PKT_HELLO = 1
+PKT_WELCOME = 2
+PKT_INPUT = 3
+PKT_SYNC = 4
+WELCOME = struct.Struct("<BIHH")
+INPUT = struct.Struct("<BIIbIB")
+SYNC = struct.Struct("<BI8s")
+MAX_INPUTS_PER_PACKET = 64
+SYNC_INTERVAL = 80  # frames between checksum exchanges
+
+
+def to_engine_inputs(side: str, bits: int) -> int:
+    up, down, launch = _SIDE_BITS[side]
+    return (up if bits & NET_UP else 0) | (down if bits & NET_DOWN else 0) | (launch if bits & NET_LAUNCH else 0)
+
+
+class LinkShim:
+    """Delays and drops outgoing datagrams to emulate a bad network on localhost.
+
+    Each packet is lost with probability loss, otherwise handed to the real
+    socket latency_ms (+/- jitter_ms) later. Call pump() regularly; with a
+    shim on both peers the round trip is twice latency_ms.
+    """
+
+    def __init__(self, sock: socket.socket, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 loss: float = 0.0, seed: Optional[int] = None) -> None:
+        self.sock = sock
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self._rng = random.Random(seed)
+        self._queue: list[tuple[float, int, bytes, tuple]] = []
+        self._seq = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def sendto(self, data: bytes, addr: tuple) -> None:
+        self.sent += 1
+        if self._rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        self._seq += 1
+        heapq.heappush(self._queue, (time.perf_counter() + max(0.0, delay) / 1000.0, self._seq, data, addr))
+        self.pump()
+
+    def pump(self) -> None:
+        now = time.perf_counter()
+        while self._queue and self._queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self._queue)
+            try:
+                self.sock.sendto(data, addr)
+            except OSError:
+                pass
+
+
+class NetSession:
+    """Peer-to-peer match that exchanges only inputs and rolls back on mispredictions.
+
+    Both peers run the same seeded GameState. Local inputs are scheduled
+    input_delay frames ahead and sent with every packet until acknowledged,
+    so a lost datagram is covered by the next one. Missing remote inputs are
+    predicted by repeating the last confirmed one (without launch); when the
+    real input differs, the state is restored from the snapshot taken before
+    the first wrong frame and re-simulated up to the present.
+    """
+
+    def __init__(self, sock: socket.socket, peer: tuple, side: str, seed: int,
+                 width: int = cfg.WINDOW_WIDTH, height: int = cfg.WINDOW_HEIGHT,
+                 link: Optional[LinkShim] = None, input_delay: int = cfg.NET_INPUT_DELAY,
+                 max_prediction: int = cfg.NET_MAX_PREDICTION) -> None:
+        self.sock = sock
+        self.peer = peer
+        self.side = side
+        self.remote_side = 'right' if side == 'left' else 'left'
+        self.link = link
+        self.input_delay = input_delay
+        self.max_prediction = max_prediction
+        self.state = GameState(width, height, seed=seed)
+        self.dt_ms = 1000.0 / cfg.TICK_RATE
+
+        self._local: dict[int, int] = {}
+        self._remote: dict[int, int] = {}
+        self._predicted: dict[int, int] = {}
+        self._snapshots: dict[int, tuple] = {}
+        self._checksums: dict[int, bytes] = {}
+        self._peer_checksums: dict[int, bytes] = {}
+        self._next_sync = SYNC_INTERVAL
+        self.confirmed = 0        # all remote inputs up to this frame are known
+        self.peer_has = 0         # peer has all our inputs up to this frame
+        self.peer_frame = 0       # peer's frame as last reported
+        self.peer_advantage = 0
+        self._skew = 0.0          # smoothed (our advantage - peer's advantage)
+        self._rollback_from: Optional[int] = None
+        self.rollbacks = 0
+        self.rollback_frames = 0
+        self.desynced_at: Optional[int] = None
+        self.last_heard = time.perf_counter()
+
+    # -- networking -------------------------------------------------------
+    def _send(self, data: bytes) -> None:
+        if self.link:
+            self.link.sendto(data, self.peer)
+        else:
+            try:
+                self.sock.sendto(data, self.peer)
+            except OSError:
+                pass
+
+    def _send_inputs(self) -> None:
+        last = self.state.tick + self.input_delay
+        first = max(self.peer_has + 1, last - MAX_INPUTS_PER_PACKET + 1)
+        body = bytes(self._local.get(f, 0) for f in range(first, last + 1))
+        advantage = max(-128, min(127, self.state.tick - self.peer_frame))
+        self._send(INPUT.pack(PKT_INPUT, self.state.tick, self.confirmed, advantage, first, len(body)) + body)
+
+    def poll(self) -> None:
+        """Drain received datagrams; call once per frame before advance()."""
+        if self.link:
+            self.link.pump()
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # e.g. ICMP port unreachable while the peer is still starting
+                continue
+            if addr != self.peer or not data:
+                continue
+            self.last_heard = time.perf_counter()
+            kind = data[0]
+            if kind == PKT_INPUT and len(data) >= INPUT.size:
+                self._on_inputs(data)
+            elif kind == PKT_SYNC and len(data) >= SYNC.size:
+                _, frame, checksum = SYNC.unpack_from(data)
+                self._peer_checksums[frame] = checksum
+                self._compare_checksums()
+            elif kind == PKT_HELLO and self.side == 'left':
+                # Our WELCOME was lost; the joiner is still asking
+                self.sock.sendto(WELCOME.pack(PKT_WELCOME, self.state.seed, self.state.width, self.state.height), self.peer)
+
+    def _on_inputs(self, data: bytes) -> None:
+        _, frame, peer_has, advantage, first, count = INPUT.unpack_from(data)
+        self.peer_frame = max(self.peer_frame, frame)
+        self.peer_has = max(self.peer_has, peer_has)
+        self.peer_advantage = advantage
+        body = data[INPUT.size:INPUT.size + count]
+        # Accept only the contiguous continuation; gaps are re-sent until acknowledged
+        for offset, bits in enumerate(body):
+            f = first + offset
+            if f != self.confirmed + 1:
+                continue
+            self._remote[f] = bits
+            self.confirmed = f
+            if f <= self.state.tick and self._predicted.get(f) != bits:
+                if self._rollback_from is None or f < self._rollback_from:
+                    self._rollback_from = f
+
+    # -- simulation -------------------------------------------------------
+    def _remote_input(self, frame: int) -> int:
+        bits = self._remote.get(frame)
+        if bits is None:
+            bits = self._remote.get(self.confirmed, 0) & ~NET_LAUNCH
+            self._predicted[frame] = bits
+        else:
+            self._predicted.pop(frame, None)
+        return bits
+
+    def _step(self, frame: int) -> None:
+        self._snapshots[frame] = self.state.snapshot()
+        inputs = (to_engine_inputs(self.side, self._local.get(frame, 0))
+                  | to_engine_inputs(self.remote_side, self._remote_input(frame)))
+        self.state.step(inputs, self.dt_ms)
+
+    def _rollback(self) -> None:
+        frame, self._rollback_from = self._rollback_from, None
+        if frame is None or frame not in self._snapshots:
+            return
+        present = self.state.tick
+        self.state.restore(self._snapshots[frame])
+        for f in range(frame, present + 1):
+            self._step(f)
+        self.rollbacks += 1
+        self.rollback_frames += present - frame + 1
+
+    def should_wait(self) -> bool:
+        """True if we are too far ahead of the peer and should skip this tick."""
+        frame = self.state.tick + 1
+        if frame - self.confirmed > self.max_prediction:
+            return True
+        # Time sync: both sides see the other behind by the one-way latency, so
+        # a larger advantage than the peer's means our clock runs ahead. Both
+        # are noisy, so act on a smoothed value and re-measure after each wait
+        self._skew += 0.1 * (self.state.tick - self.peer_frame - self.peer_advantage - self._skew)
+        if self._skew >= 2.0:
+            self._skew = 0.0
+            return True
+        return False
+
+    @property
+    def finished(self) -> bool:
+        """True once the match has a winner that no late input can undo."""
+        return self.state.winner is not None and self.confirmed >= self.state.tick
+
+    def advance(self, local_bits: int) -> bool:
+        """Run one tick with the local player's NET_* bits.
+
+        Returns False without consuming local_bits when waiting for the peer.
+        Events of the tick are in self.state.events.
+        """
+        self._rollback()
+        if self.should_wait():
+            self._send_inputs()
+            return False
+        frame = self.state.tick + 1
+        self._local.setdefault(frame + self.input_delay, local_bits)
+        self._step(frame)
+        self._send_inputs()
+        self._confirm()
+        return True
+
+    def _confirm(self) -> None:
+        """Exchange checksums of newly confirmed frames and drop history that can no longer be rolled back."""
+        final = min(self.confirmed, self.state.tick)
+        while self._next_sync <= final:
+            f = self._next_sync
+            # Snapshot f + 1 is the state right after frame f
+            snap = self._snapshots.get(f + 1)
+            self._checksums[f] = self._checksum_of(snap) if snap else self.state.checksum()
+            self._send(SYNC.pack(PKT_SYNC, f, self._checksums[f]))
+            self._next_sync += SYNC_INTERVAL
+        self._compare_checksums()
+
+        for d in (self._snapshots, self._predicted):
+            for f in [f for f in d if f <= final]:
+                del d[f]
+        for f in [f for f in self._remote if f < final]:
+            del self._remote[f]
+        for f in [f for f in self._local if f <= min(final, self.peer_has)]:
+            del self._local[f]
+
+    def _checksum_of(self, snap: tuple) -> bytes:
+        current = self.state.snapshot()
+        self.state.restore(snap)
+        checksum = self.state.checksum()
+        self.state.restore(current)
+        return checksum
+
+    def _compare_checksums(self) -> None:
+        for f in [f for f in self._peer_checksums if f in self._checksums]:
+            if self._peer_checksums.pop(f) != self._checksums.pop(f) and self.desynced_at is None:
+                self.desynced_at = f
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def _udp_socket(port: int = 0) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("0.0.0.0", port))
+    sock.setblocking(False)
+    return sock
+
+
+def host(port: int, width: int, height: int, seed: Optional[int] = None, link_args: Optional[dict] = None,
+         timeout_s: float = 120.0, should_abort=None) -> Optional[NetSession]:
+    """Wait for a joiner on UDP port and return the session (we play left), or None on timeout/abort."""
+    sock = _udp_socket(port)
+    seed = seed if seed is not None else random.getrandbits(32)
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        if should_abort and should_abort():
+            break
+        try:
+            data, addr = sock.recvfrom(2048)
+        except (BlockingIOError, InterruptedError, ConnectionResetError):
+            time.sleep(0.01)
+            continue
+        if data[:1] == bytes((PKT_HELLO,)):
+            link = LinkShim(sock, **link_args) if link_args else None
+            session = NetSession(sock, addr, 'left', seed, width, height, link=link)
+            # The handshake bypasses the shim; only gameplay traffic is degraded
+            sock.sendto(WELCOME.pack(PKT_WELCOME, seed, width, height), addr)
+            return session
+    sock.close()
+    return None
+
+
+def join(address: str, link_args: Optional[dict] = None, timeout_s: float = 30.0,
+         should_abort=None) -> Optional[NetSession]:
+    """Connect to a host at "host:port" and return the session (we play right), or None on timeout/abort."""
+    name, _, port = address.rpartition(":")
+    peer = (socket.gethostbyname(name or "127.0.0.1"), int(port))
+    sock = _udp_socket()
+    deadline = time.perf_counter() + timeout_s
+    next_hello = 0.0
+    while time.perf_counter() < deadline:
+        if should_abort and should_abort():
+            break
+        now = time.perf_counter()
+        if now >= next_hello:
+            try:
+                sock.sendto(bytes((PKT_HELLO,)), peer)
+            except OSError:
+                pass
+            next_hello = now + 0.2
+        try:
+            data, addr = sock.recvfrom(2048)
+        except (BlockingIOError, InterruptedError, ConnectionResetError):
+            time.sleep(0.01)
+            continue
+        if addr == peer and len(data) >= WELCOME.size and data[0] == PKT_WELCOME:
+            _, seed, width, height = WELCOME.unpack_from(data)
+            link = LinkShim(sock, **link_args) if link_args else None
+            return NetSession(sock, peer, 'right', seed, width, height, link=link)
+    sock.close()
+    return None
@@ -0,0 +1,147 @@
+import sys
+import time
+from array import array
+from typing import Optional
+
+import pygame
+
+import config as cfg
+import screen
+
+
+# Frame pacing modes (--pacing)
+PACE_SLEEP = "sleep"        # pygame Clock.tick: SDL_Delay, ~1 ms granularity plus scheduler wakeup jitter
+PACE_BUSY = "busy"          # Clock.tick_busy_loop: spins for the whole wait, precise but burns a core
+PACE_HYBRID = "hybrid"      # sleep to spin_ms before an absolute deadline, then spin
+PACE_VSYNC = "vsync"        # no wait of its own; display.flip blocks on the vertical blank
+PACE_UNCAPPED = "uncapped"  # no wait at all, for benchmarking
+PACING_MODES = cfg.PACING_MODES
+
+
+class FrameTimeStats:
+    """Frame-to-frame intervals: a histogram since the last reset() plus the
+    most recent `capacity` samples in a ring buffer, for percentiles."""
+
+    def __init__(self, capacity: int = cfg.FRAME_TIME_SAMPLES, bin_ms: float = cfg.FRAME_TIME_BIN_MS,
+                 max_ms: float = cfg.FRAME_TIME_MAX_MS) -> None:
+        self.capacity = capacity
+        self.bin_ms = bin_ms
+        self.bins = int(max_ms / bin_ms)  # plus one overflow bin
+        self._samples = array("d", bytes(8 * capacity))
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = array("L", [0]) * (self.bins + 1)
+        self.count = 0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self._samples[self.count % self.capacity] = ms
+        self.count += 1
+        self.counts[min(self.bins, int(ms / self.bin_ms))] += 1
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def recent(self) -> list[float]:
+        n = min(self.count, self.capacity)
+        return list(self._samples[:n])
+
+    def summary(self) -> Optional[dict]:
+        """Mean, standard deviation (the jitter), percentiles and max of the recent samples."""
+        values = sorted(self.recent())
+        n = len(values)
+        if n < 2:
+            return None
+        mean = sum(values) / n
+        sd = (sum((v - mean) ** 2 for v in values) / (n - 1)) ** 0.5
+        result = {"frames": n, "mean": mean, "sd": sd, "max": values[-1]}
+        for p in (50, 90, 99, 99.9):
+            result[f"p{p:g}"] = values[min(n - 1, int(n * p / 100))]
+        return result
+
+    def report(self, target_ms: float = 0.0) -> str:
+        """Text summary and histogram (all samples since reset), for the terminal."""
+        s = self.summary()
+        if s is None:
+            return "frame times: no samples"
+        lines = [f"frame times ({s['frames']} recent frames): mean {s['mean']:.2f} ms  sd {s['sd']:.2f}  "
+                 f"p50 {s['p50']:.2f}  p90 {s['p90']:.2f}  p99 {s['p99']:.2f}  p99.9 {s['p99.9']:.2f}  max {s['max']:.2f}"]
+        top = max(self.counts)
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            low = i * self.bin_ms
+            label = f">={low:6.1f}" if i == self.bins else f"{low:6.1f}-{low + self.bin_ms:<5.1f}"
+            mark = " <" if target_ms and low <= target_ms < low + self.bin_ms else ""
+            lines.append(f"  {label:13s}{c:8d} {'#' * round(50 * c / top)}{mark}")
+        return "\n".join(lines)
+
+
+class FramePacer:
+    """Waits out each frame to `fps` in one of PACING_MODES and records the
+    interval between successive wait() returns (the frame delivery period)
+    in self.stats.
+
+    fps 0 means uncapped for the timed modes. In vsync mode the window must
+    come from open_window(); if the driver refuses vsync, the pacer falls
+    back to hybrid and says so on stderr.
+    """
+
+    def __init__(self, mode: str = cfg.PACING, fps: int = cfg.RENDER_FPS, spin_ms: float = cfg.PACING_SPIN_MS) -> None:
+        self.mode = mode
+        self.fps = fps
+        self.period = 1.0 / fps if fps > 0 else 0.0
+        self.spin = spin_ms / 1000.0
+        self.stats = FrameTimeStats()
+        self._clock = pygame.time.Clock()
+        self._deadline = 0.0
+        self._last = 0.0
+        self._skip = True
+
+    @property
+    def target_ms(self) -> float:
+        """Intended frame period; 0 when nothing paces the loop (or the display's refresh does)."""
+        return self.period * 1000.0 if self.mode not in (PACE_VSYNC, PACE_UNCAPPED) else 0.0
+
+    def open_window(self, size: tuple[int, int]) -> pygame.Surface:
+        """screen.open_window() for a playfield of size, with vsync in vsync mode."""
+        if self.mode == PACE_VSYNC:
+            # SDL only honours vsync for renderer-backed windows (the "scaled" scaling mode)
+            try:
+                return screen.open_window(size, vsync=True)
+            except pygame.error as exc:
+                print(f"vsync unavailable ({exc}); pacing with {PACE_HYBRID} instead", file=sys.stderr)
+                self.mode = PACE_HYBRID
+        return screen.open_window(size)
+
+    def skip(self) -> None:
+        """Leave the next interval out of the statistics (after a pause, a menu or a blocking wait)."""
+        self._skip = True
+
+    def wait(self) -> None:
+        mode = self.mode
+        if mode == PACE_SLEEP:
+            self._clock.tick(self.fps)
+        elif mode == PACE_BUSY:
+            self._clock.tick_busy_loop(self.fps)
+        elif mode == PACE_HYBRID and self.period:
+            self._wait_until_deadline()
+        now = time.perf_counter()
+        if not self._skip:
+            self.stats.add((now - self._last) * 1000.0)
+        self._skip = False
+        self._last = now
+
+    def _wait_until_deadline(self) -> None:
+        # Absolute deadlines, so oversleeping one frame is made up in the next
+        # instead of accumulating as drift; more than a frame behind resyncs
+        now = time.perf_counter()
+        deadline = self._deadline
+        if now - deadline > self.period:
+            deadline = now
+        remaining = deadline - now - self.spin
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < deadline:
+            pass
+        self._deadline = deadline + self.period
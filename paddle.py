@@ -1,8 +1,12 @@
-import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
 
 
 class Paddle:
     """Represents a paddle controlled by a player."""
+    __slots__ = ("x", "y", "width", "height", "speed", "_rect")
 
     def __init__(self, x: int, y: int, width: int, height: int, speed: int) -> None:
         self.x = x
@@ -10,10 +14,22 @@ class Paddle:
         self.width = width
         self.height = height
         self.speed = speed
+        self._rect = None
 
     @property
-    def rect(self) -> pygame.Rect:
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+    def rect(self) -> "pygame.Rect":
+        """The paddle's rect, one object for the paddle's lifetime, synced to x/y on access.
+
+        Callers that keep it across frames must copy() it. pygame is imported
+        on first use, so the simulation runs without it.
+        """
+        rect = self._rect
+        if rect is None:
+            from pygame import Rect
+            rect = self._rect = Rect(self.x, self.y, self.width, self.height)
+        rect.x = self.x
+        rect.y = self.y
+        return rect
 
     @property
     def center_y(self) -> float:
@@ -1,51 +1,133 @@
 import math
-import pygame
+
+
+# Bounce angle limits seen so far, degrees -> radians
+_max_angle_rad: dict[float, float] = {}
 
 
 def ball_intersects_paddle(ball, paddle) -> bool:
-    return paddle.rect.colliderect(
-        pygame.Rect(int(ball.x - ball.radius), int(ball.y - ball.radius), ball.radius * 2, ball.radius * 2)
-    )
+    """Exact circle vs. paddle rectangle overlap (touching does not count)."""
+    r = ball.radius
+    x = ball.x
+    left = paddle.x
+    right = left + paddle.width
+    # Mid-court early-out before any y arithmetic
+    if x + r <= left or x - r >= right:
+        return False
+    y = ball.y
+    top = paddle.y
+    bottom = top + paddle.height
+    dx = left - x if x < left else (x - right if x > right else 0.0)
+    dy = top - y if y < top else (y - bottom if y > bottom else 0.0)
+    return dx * dx + dy * dy < r * r
 
 
-def handle_collision(ball, left_paddle, right_paddle, current_speed: float, window_height: int, max_bounce_angle_deg: float, snd_paddle) -> bool:
-    """Handle ball collisions with top/bottom bounds and paddles with angle deflection."""
-    if ball.y - ball.radius <= 0:
-        ball.y = ball.radius
-        ball.vel_y = abs(ball.vel_y)
-    elif ball.y + ball.radius >= window_height:
-        ball.y = window_height - ball.radius
-        ball.vel_y = -abs(ball.vel_y)
+def _sweep_paddle_face(x0: float, y0: float, dx: float, dy: float, paddle, radius: int, facing: int):
+    """Time of impact in [0, 1] of a ball moving (dx, dy) from (x0, y0) against a paddle face.
 
-    max_angle_rad = math.radians(max_bounce_angle_deg)
+    facing is +1 for the left paddle (face on its right edge) and -1 for the right
+    paddle. The face is grown by the ball radius and spans the paddle height
+    plus the radius either way, which is slightly generous at the corners
+    compared with ball_intersects_paddle. Returns None on a miss.
+    """
+    if facing > 0:
+        face_x = paddle.x + paddle.width + radius
+        if dx >= 0 or x0 < face_x:
+            return None
+    else:
+        face_x = paddle.x - radius
+        if dx <= 0 or x0 > face_x:
+            return None
+    t = (face_x - x0) / dx
+    if t > 1.0:
+        return None
+    y = y0 + dy * t
+    if paddle.y - radius <= y <= paddle.y + paddle.height + radius:
+        return t
+    return None
 
-    if ball_intersects_paddle(ball, left_paddle) and ball.vel_x < 0:
-        relative_intersect_y = (ball.y - left_paddle.center_y)
-        normalized = max(-1.0, min(1.0, relative_intersect_y / (left_paddle.height / 2)))
-        bounce_angle = normalized * max_angle_rad
 
-        speed = current_speed
-        ball.vel_x = speed * math.cos(bounce_angle)
-        ball.vel_y = speed * math.sin(bounce_angle)
+def _sweep_wall(y0: float, dy: float, radius: int, window_height: int):
+    """Time of impact in [0, 1] against the top or bottom wall, or None."""
+    if dy < 0 and y0 + dy - radius <= 0:
+        return max(0.0, (radius - y0) / dy)
+    if dy > 0 and y0 + dy + radius >= window_height:
+        return max(0.0, (window_height - radius - y0) / dy)
+    return None
 
-        ball.x = left_paddle.x + left_paddle.width + ball.radius
-        if snd_paddle:
-            snd_paddle.play()
-        return True
 
-    elif ball_intersects_paddle(ball, right_paddle) and ball.vel_x > 0:
-        relative_intersect_y = (ball.y - right_paddle.center_y)
-        normalized = max(-1.0, min(1.0, relative_intersect_y / (right_paddle.height / 2)))
-        bounce_angle = normalized * max_angle_rad
+def _deflect(ball, paddle, speed: float, max_angle_rad: float, direction: int) -> None:
+    relative_intersect_y = (ball.y - paddle.center_y)
+    normalized = max(-1.0, min(1.0, relative_intersect_y / (paddle.height / 2)))
+    bounce_angle = normalized * max_angle_rad
+    ball.vel_x = direction * speed * math.cos(bounce_angle)
+    ball.vel_y = speed * math.sin(bounce_angle)
+
+
+def handle_collision(ball, left_paddle, right_paddle, current_speed: float, window_height: int, max_bounce_angle_deg: float, events: list | None = None) -> bool:
+    """Handle ball collisions with top/bottom bounds and paddles with angle deflection.
+
+    Must be called right after Ball.move(): the motion of the last tick is swept
+    from (x - vel_x, y - vel_y) so contacts are resolved at their exact time of
+    impact, and the ball travels the rest of the tick on its new heading.
+    "hit" and "wall" are appended to events (if given) for each contact.
+    """
+    max_angle_rad = _max_angle_rad.get(max_bounce_angle_deg)
+    if max_angle_rad is None:
+        max_angle_rad = _max_angle_rad[max_bounce_angle_deg] = math.radians(max_bounce_angle_deg)
+    radius = ball.radius
 
-        speed = current_speed
-        ball.vel_x = -speed * math.cos(bounce_angle)
-        ball.vel_y = speed * math.sin(bounce_angle)
+    x0 = ball.x - ball.vel_x
+    y0 = ball.y - ball.vel_y
+    remaining = 1.0
+    hit = False
+    for _ in range(4):
+        dx = ball.vel_x * remaining
+        dy = ball.vel_y * remaining
+        t_wall = _sweep_wall(y0, dy, radius, window_height)
+        if ball.vel_x < 0:
+            paddle, direction = left_paddle, 1
+        else:
+            paddle, direction = right_paddle, -1
+        t_paddle = _sweep_paddle_face(x0, y0, dx, dy, paddle, radius, direction)
 
+        if t_wall is None and t_paddle is None:
+            break
+        if t_paddle is not None and (t_wall is None or t_paddle <= t_wall):
+            ball.x = x0 + dx * t_paddle
+            ball.y = y0 + dy * t_paddle
+            _deflect(ball, paddle, current_speed, max_angle_rad, direction)
+            remaining *= 1.0 - t_paddle
+            hit = True
+            if events is not None:
+                events.append("hit")
+        else:
+            ball.x = x0 + dx * t_wall
+            ball.y = radius if dy < 0 else window_height - radius
+            ball.vel_y = -ball.vel_y
+            remaining *= 1.0 - t_wall
+            if events is not None:
+                events.append("wall")
+        x0, y0 = ball.x, ball.y
+    ball.x = x0 + ball.vel_x * remaining
+    ball.y = y0 + ball.vel_y * remaining
+
+    if hit:
+        return True
+
+    # Discrete fallback for contacts the sweep can't see, e.g. a paddle moving onto the ball
+    if ball.vel_x < 0 and ball_intersects_paddle(ball, left_paddle):
+        _deflect(ball, left_paddle, current_speed, max_angle_rad, 1)
+        ball.x = left_paddle.x + left_paddle.width + ball.radius
+        if events is not None:
+            events.append("hit")
+        return True
+
+    elif ball.vel_x > 0 and ball_intersects_paddle(ball, right_paddle):
+        _deflect(ball, right_paddle, current_speed, max_angle_rad, -1)
         ball.x = right_paddle.x - ball.radius
-        if snd_paddle:
-            snd_paddle.play()
+        if events is not None:
+            events.append("hit")
         return True
 
     return False
-
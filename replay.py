@@ -0,0 +1,103 @@
+import os
+import struct
+import time
+from typing import Optional
+
+import config as cfg
+from ai import profiles_from_json, profiles_to_json
+from engine import GameState
+
+
+# File layout (little endian):
+#   header: magic, version, seed, tick rate, width, height, left/right AI code,
+#           length of the AI profile table, then the table as JSON
+#   body:   one byte per tick holding the engine input bitmask (< 0x80), plus
+#           control records: 0x80 | side << 6 | ai_code switches an AI level
+#           between ticks, 0xFF is followed by the final tick count and
+#           GameState.checksum() when the match ends.
+# AI codes are 0 for none, else 1 + the level's index in the profile table.
+MAGIC = b"PRPL"
+VERSION = 4  # bumped whenever simulation changes invalidate recordings
+HEADER = struct.Struct("<4sBIHHHBBH")
+FOOTER = struct.Struct("<I8s")
+AI_CHANGE = 0x80
+END = 0xFF
+MAX_AI_CODE = 0x3E
+
+
+def _ai_code(levels: list, level: Optional[str]) -> int:
+    code = levels.index(level) + 1 if level else 0
+    if code > MAX_AI_CODE:
+        raise ValueError(f"too many AI levels to record {level!r}")
+    return code
+
+
+def _ai_level(levels: list, code: int) -> Optional[str]:
+    return levels[code - 1] if code else None
+
+
+class ReplayRecorder:
+    """Append-only recorder for one match; call record() before every GameState.step()."""
+
+    def __init__(self, path: str, state: GameState) -> None:
+        self.path = path
+        self._levels = list(state.profiles)
+        table = profiles_to_json(state.profiles).encode("utf-8")
+        self._fh = open(path, "wb")
+        self._fh.write(HEADER.pack(MAGIC, VERSION, state.seed, cfg.TICK_RATE, state.width, state.height,
+                                   _ai_code(self._levels, state.left_ai), _ai_code(self._levels, state.right_ai), len(table)))
+        self._fh.write(table)
+
+    def record(self, inputs: int) -> None:
+        self._fh.write(bytes((inputs & 0x7F,)))
+
+    def record_ai_change(self, side: str, level: Optional[str]) -> None:
+        """Record a GameState.set_ai() call made between ticks."""
+        self._fh.write(bytes((AI_CHANGE | (side == 'right') << 6 | _ai_code(self._levels, level),)))
+
+    def finish(self, state: GameState) -> None:
+        self._fh.write(bytes((END,)) + FOOTER.pack(state.tick, state.checksum()))
+        self.close()
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+
+def replay_path(directory: str, seed: int) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"match-{time.strftime('%Y%m%d-%H%M%S')}-{seed:08x}.pongrpl")
+
+
+def play_replay(path: str) -> tuple[GameState, bool | None]:
+    """Re-simulate a recorded match as fast as possible.
+
+    Returns the final state and whether it matches the recorded checksum
+    (None if the recording has no footer, e.g. the match was abandoned).
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    magic, version, seed, tick_rate, width, height, left_code, right_code, table_len = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} replay")
+    pos = HEADER.size + table_len
+    profiles = profiles_from_json(data[HEADER.size:pos].decode("utf-8"), path)
+    levels = list(profiles)
+
+    state = GameState(width, height, left_ai=_ai_level(levels, left_code), right_ai=_ai_level(levels, right_code),
+                      seed=seed, profiles=profiles)
+    dt_ms = 1000.0 / tick_rate
+    step = state.step
+
+    end = len(data)
+    while pos < end:
+        b = data[pos]
+        pos += 1
+        if b < AI_CHANGE:
+            step(b, dt_ms)
+        elif b == END:
+            ticks, checksum = FOOTER.unpack_from(data, pos)
+            return state, ticks == state.tick and checksum == state.checksum()
+        else:
+            state.set_ai('right' if b & 0x40 else 'left', _ai_level(levels, b & 0x3F))
+    return state, None
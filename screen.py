@@ -0,0 +1,149 @@
+from typing import Optional, Sequence
+
+import pygame
+
+import config as cfg
+
+
+# How the canvas reaches the real window (--scaling)
+SCALE_SDL = "scaled"        # pygame.SCALED: SDL's renderer stretches the canvas, on the GPU where there is one
+SCALE_INTEGER = "integer"   # largest whole-number factor that fits, letterboxed; sharp pixels
+SCALE_SMOOTH = "smooth"     # fill the window keeping the aspect ratio, filtered (smoothscale)
+SCALE_MODES = cfg.SCALE_MODES
+
+
+class Screen:
+    """The render canvas for a playfield, and how the canvas is presented in the window.
+
+    The playfield is the simulation's coordinate space (cfg.WINDOW_WIDTH x
+    WINDOW_HEIGHT units). The canvas is render_size pixels, shrunk to the
+    playfield's aspect ratio if needed; playfield units map onto it at
+    world_scale pixels per unit. With SCALE_SDL the canvas is the display
+    surface itself and SDL does the scaling (and maps mouse coordinates
+    back). Otherwise the canvas is an offscreen surface that present()
+    scales into the window, and to_canvas() maps window coordinates back.
+    A window of exactly the canvas size uses the display surface directly
+    in every mode.
+    """
+
+    def __init__(self, playfield_size: tuple[int, int], render_size: Optional[tuple[int, int]] = cfg.RENDER_SIZE,
+                 scaling: str = cfg.RENDER_SCALING, window_size: Optional[tuple[int, int]] = cfg.WINDOW_SIZE,
+                 fullscreen: bool = cfg.FULLSCREEN, vsync: bool = False) -> None:
+        pw, ph = self.playfield_size = playfield_size
+        rw, rh = render_size or playfield_size
+        self.world_scale = min(rw / pw, rh / ph)
+        canvas_size = self.canvas_size = (max(1, round(pw * self.world_scale)), max(1, round(ph * self.world_scale)))
+        self.scaling = scaling
+        fullscreen_flag = pygame.FULLSCREEN if fullscreen else 0
+        if scaling == SCALE_SDL:
+            self.window = pygame.display.set_mode(canvas_size, pygame.SCALED | fullscreen_flag, vsync=int(vsync))
+        elif fullscreen:
+            self.window = pygame.display.set_mode((0, 0), fullscreen_flag, vsync=int(vsync))
+        else:
+            self.window = pygame.display.set_mode(window_size or playfield_size, 0, vsync=int(vsync))
+        self.direct = scaling == SCALE_SDL or self.window.get_size() == canvas_size
+        self.canvas = self.window if self.direct else pygame.Surface(canvas_size).convert()
+        self._fit()
+
+    def _fit(self) -> None:
+        """Destination rect of the scaled canvas, and the letterbox bars around it."""
+        cw, ch = self.canvas_size
+        ww, wh = self.window.get_size()
+        self.factor = min(ww // cw, wh // ch)
+        if self.scaling == SCALE_INTEGER and self.factor >= 1:
+            size = (cw * self.factor, ch * self.factor)
+        else:
+            # Smooth scaling, or a window smaller than the canvas
+            scale = min(ww / cw, wh / ch)
+            size = (max(1, round(cw * scale)), max(1, round(ch * scale)))
+            self.factor = 0
+        self.dest = pygame.Rect((0, 0), size)
+        self.dest.center = (ww // 2, wh // 2)
+        self.bars = [r for r in (pygame.Rect(0, 0, ww, self.dest.top), pygame.Rect(0, self.dest.bottom, ww, wh - self.dest.bottom),
+                                 pygame.Rect(0, self.dest.top, self.dest.left, self.dest.h),
+                                 pygame.Rect(self.dest.right, self.dest.top, ww - self.dest.right, self.dest.h)) if r.w > 0 and r.h > 0]
+        self._target = None if self.direct else self.window.subsurface(self.dest)
+
+    def present(self, rects: Optional[Sequence[pygame.Rect]] = None) -> None:
+        """Show the canvas: all of it, or only rects (canvas pixels) when given."""
+        if self.direct:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        if rects is not None and self.factor:
+            # Whole-number factor: scale just the changed regions
+            k = self.factor
+            bounds = self.canvas.get_rect()
+            updated = []
+            for rect in rects:
+                rect = rect.clip(bounds)
+                if rect.w and rect.h:
+                    out = pygame.Rect(self.dest.x + rect.x * k, self.dest.y + rect.y * k, rect.w * k, rect.h * k)
+                    pygame.transform.scale(self.canvas.subsurface(rect), out.size, self.window.subsurface(out))
+                    updated.append(out)
+            pygame.display.update(updated)
+            return
+        if self.factor:
+            pygame.transform.scale(self.canvas, self.dest.size, self._target)
+        else:
+            pygame.transform.smoothscale(self.canvas, self.dest.size, self._target)
+        for bar in self.bars:
+            self.window.fill(cfg.BLACK, bar)
+        pygame.display.flip()
+
+    def to_canvas(self, pos: tuple[int, int]) -> tuple[int, int]:
+        if self.direct:
+            return pos
+        cw, ch = self.canvas_size
+        return ((pos[0] - self.dest.x) * cw // self.dest.w, (pos[1] - self.dest.y) * ch // self.dest.h)
+
+
+# The screen opened last; present() and friends fall back to the plain
+# display functions when there is none (a window from set_mode directly)
+_screen: Optional[Screen] = None
+_options = {"render_size": cfg.RENDER_SIZE, "scaling": cfg.RENDER_SCALING, "window_size": cfg.WINDOW_SIZE,
+            "fullscreen": cfg.FULLSCREEN}
+
+
+def configure(render_size: Optional[tuple[int, int]] = cfg.RENDER_SIZE, scaling: str = cfg.RENDER_SCALING,
+              window_size: Optional[tuple[int, int]] = cfg.WINDOW_SIZE, fullscreen: bool = cfg.FULLSCREEN) -> None:
+    """Set the canvas size and scaling of windows opened afterwards by open_window()."""
+    _options.update(render_size=render_size, scaling=scaling, window_size=window_size, fullscreen=fullscreen)
+
+
+def open_window(playfield_size: tuple[int, int], vsync: bool = False) -> pygame.Surface:
+    """Open (or reopen) the window for a playfield of playfield_size and return the canvas to draw on."""
+    global _screen
+    _screen = Screen(playfield_size, vsync=vsync, **_options)
+    return _screen.canvas
+
+
+def present(rects: Optional[Sequence[pygame.Rect]] = None) -> None:
+    if _screen is not None:
+        _screen.present(rects)
+    elif rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
+
+
+def to_canvas(pos: tuple[int, int]) -> tuple[int, int]:
+    """Window coordinates (mouse events) to canvas pixels."""
+    return _screen.to_canvas(pos) if _screen is not None else pos
+
+
+def mouse_pos() -> tuple[int, int]:
+    """pygame.mouse.get_pos() in canvas pixels."""
+    return to_canvas(pygame.mouse.get_pos())
+
+
+def world_scale() -> float:
+    """Canvas pixels per playfield unit (1.0 without a screen)."""
+    return _screen.world_scale if _screen is not None else 1.0
+
+
+def scaled(px: float) -> int:
+    """A size given for the full-size canvas (font sizes, margins), at the current canvas scale."""
+    return max(1, round(px * world_scale()))
@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import random
+import statistics
+import struct
+import time
+from typing import Optional
+
+import config as cfg
+from ai import AI_LEVELS
+from engine import GameState
+from netplay import NET_UP, NET_DOWN, NET_LAUNCH, to_engine_inputs
+
+
+# Wire protocol over TCP; every message starts with a type byte and has a fixed size.
+# Client -> server:
+#   JOIN  'J' level   level n >= 1 plays AI_LEVELS[n - 1] (the profile table's order), 0 waits for another human
+#   INPUT 'I' bits    NET_UP | NET_DOWN | NET_LAUNCH, held until the next INPUT
+# Server -> client:
+#   WELCOME 'W' match id, side (0 left, 1 right), width, height, tick rate
+#   STATE   'S' tick, ball x/y and paddle ys in 1/8 px, scores, flags, events
+JOIN = struct.Struct("<cB")
+INPUT = struct.Struct("<cB")
+WELCOME = struct.Struct("<cIBHHH")
+STATE = struct.Struct("<cIhhhhBBBB")
+SUBPIXEL = 8
+
+# STATE flags
+FLAG_HELD_LEFT = 1
+FLAG_HELD_RIGHT = 2
+FLAG_WIN_LEFT = 4
+FLAG_WIN_RIGHT = 8
+# STATE event bits, in engine event order
+EVENT_BITS = {"launch": 1, "hit": 2, "wall": 4, "score": 8, "win": 16}
+
+MAX_WRITE_BUFFER = 16 * 1024  # skip updates to clients that stop reading
+
+
+class Client:
+    __slots__ = ("writer", "match", "side", "bits")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.match: Optional["Match"] = None
+        self.side = 'left'
+        self.bits = 0
+
+
+class Match:
+    """One GameState plus the clients playing it and its CPU accounting."""
+
+    def __init__(self, match_id: int, state: GameState) -> None:
+        self.id = match_id
+        self.state = state
+        self.clients: list[Client] = []
+        self.cpu_ns = 0
+        self.ticks = 0
+        self.finished_at: Optional[int] = None  # server tick when a winner was found
+
+    def inputs(self) -> int:
+        inputs = 0
+        for client in self.clients:
+            inputs |= to_engine_inputs(client.side, client.bits)
+            client.bits &= ~NET_LAUNCH
+        return inputs
+
+    def encode(self) -> bytes:
+        s = self.state
+        flags = 0
+        if s.held_by == 'left':
+            flags |= FLAG_HELD_LEFT
+        elif s.held_by == 'right':
+            flags |= FLAG_HELD_RIGHT
+        if s.winner == 'left':
+            flags |= FLAG_WIN_LEFT
+        elif s.winner == 'right':
+            flags |= FLAG_WIN_RIGHT
+        events = 0
+        for event in s.events:
+            events |= EVENT_BITS[event]
+        return STATE.pack(b"S", s.tick, round(s.ball.x * SUBPIXEL), round(s.ball.y * SUBPIXEL),
+                          round(s.left_paddle.y * SUBPIXEL), round(s.right_paddle.y * SUBPIXEL),
+                          s.left_score, s.right_score, flags, events)
+
+
+class MatchServer:
+    """Hosts many matches in one process and ticks them all from a single scheduler task.
+
+    Matches are stepped back to back on the event loop thread; the time each
+    one takes is charged to it, so per-match CPU cost and the tick budget
+    left over tell how many matches a core can sustain.
+    """
+
+    def __init__(self, tick_rate: int = cfg.TICK_RATE, send_every: int = 1,
+                 width: int = cfg.WINDOW_WIDTH, height: int = cfg.WINDOW_HEIGHT) -> None:
+        self.tick_rate = tick_rate
+        self.period = 1.0 / tick_rate
+        self.send_every = send_every
+        self.width = width
+        self.height = height
+        self.matches: dict[int, Match] = {}
+        self._waiting: Optional[Client] = None
+        self._next_id = 1
+        self.tick = 0
+        self.overruns = 0
+        self.dropped_ticks = 0
+        self._tick_cpu_ns: list[int] = []
+        self._lateness: list[float] = []
+
+    # -- matches ----------------------------------------------------------
+    def new_match(self, left_ai: Optional[str] = None, right_ai: Optional[str] = None) -> Match:
+        match = Match(self._next_id, GameState(self.width, self.height, left_ai=left_ai, right_ai=right_ai))
+        self.matches[match.id] = match
+        self._next_id += 1
+        return match
+
+    def add_bots(self, count: int) -> None:
+        """AI-vs-AI matches for load testing; they restart when finished."""
+        for _ in range(count):
+            self.new_match(random.choice(AI_LEVELS), random.choice(AI_LEVELS))
+
+    def _attach(self, client: Client, match: Match, side: str) -> None:
+        client.match = match
+        client.side = side
+        match.clients.append(client)
+        s = match.state
+        client.writer.write(WELCOME.pack(b"W", match.id, side == 'right', s.width, s.height, self.tick_rate))
+
+    def _end(self, match: Match) -> None:
+        self.matches.pop(match.id, None)
+        for client in match.clients:
+            client.match = None
+            client.writer.close()
+        match.clients.clear()
+
+    # -- connections ------------------------------------------------------
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = Client(writer)
+        try:
+            kind, level = JOIN.unpack(await reader.readexactly(JOIN.size))
+            if kind != b"J" or level > len(AI_LEVELS):
+                return
+            if level:
+                self._attach(client, self.new_match(right_ai=AI_LEVELS[level - 1]), 'left')
+            elif self._waiting is None or self._waiting.writer.is_closing():
+                self._waiting = client
+            else:
+                match = self.new_match()
+                self._attach(self._waiting, match, 'left')
+                self._attach(client, match, 'right')
+                self._waiting = None
+            while True:
+                kind, bits = INPUT.unpack(await reader.readexactly(INPUT.size))
+                if kind == b"I":
+                    # Keep a launch press until a tick has seen it
+                    client.bits = (bits & (NET_UP | NET_DOWN | NET_LAUNCH)) | (client.bits & NET_LAUNCH)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._waiting is client:
+                self._waiting = None
+            if client.match is not None:
+                self._end(client.match)
+            writer.close()
+
+    # -- scheduler --------------------------------------------------------
+    def step_all(self) -> None:
+        """Advance every match by one tick and queue state updates."""
+        dt_ms = 1000.0 / self.tick_rate
+        send = self.tick % self.send_every == 0
+        clock = time.thread_time_ns
+        tick_start = clock()
+        for match in list(self.matches.values()):
+            start = clock()
+            state = match.state
+            state.step(match.inputs(), dt_ms)
+            if state.winner is not None and match.finished_at is None:
+                match.finished_at = self.tick
+            match.cpu_ns += clock() - start
+            match.ticks += 1
+
+            if match.clients:
+                if send or state.events:
+                    update = match.encode()
+                    for client in match.clients:
+                        transport = client.writer.transport
+                        if transport.get_write_buffer_size() < MAX_WRITE_BUFFER:
+                            client.writer.write(update)
+                if match.finished_at is not None and self.tick - match.finished_at >= self.tick_rate:
+                    self._end(match)
+            elif match.finished_at is not None:
+                # Bot match: start over so the load stays constant
+                state.reset_match()
+                match.finished_at = None
+        self._tick_cpu_ns.append(clock() - tick_start)
+        self.tick += 1
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            now = loop.time()
+            self._lateness.append(now - next_tick)
+            behind = int((now - next_tick) / self.period)
+            if behind > cfg.MAX_TICKS_PER_FRAME:
+                # Too far behind to catch up: drop the backlog instead of bursting
+                self.dropped_ticks += behind
+                next_tick += behind * self.period
+            start = time.perf_counter()
+            self.step_all()
+            if time.perf_counter() - start > self.period:
+                self.overruns += 1
+            next_tick += self.period
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def report(self) -> str:
+        """Summary since the previous report."""
+        cpu = sorted(self._tick_cpu_ns) or [0]
+        late = sorted(self._lateness) or [0.0]
+        self._tick_cpu_ns.clear()
+        self._lateness.clear()
+        matches = list(self.matches.values())
+        per_match = [m.cpu_ns / m.ticks for m in matches if m.ticks]
+        mean_us = statistics.fmean(per_match) / 1000 if per_match else 0.0
+        max_match = max(matches, key=lambda m: m.cpu_ns / max(1, m.ticks), default=None)
+        for match in matches:
+            match.cpu_ns = match.ticks = 0
+        budget_us = self.period * 1e6
+        lines = [
+            f"tick {self.tick}: {len(matches)} matches, {sum(len(m.clients) for m in matches)} clients",
+            f"  tick cpu  p50 {cpu[len(cpu) // 2] / 1e3:.0f} us  p99 {cpu[int(len(cpu) * 0.99)] / 1e3:.0f} us"
+            f"  max {cpu[-1] / 1e3:.0f} us  (budget {budget_us:.0f} us)",
+            f"  lateness  p99 {late[int(len(late) * 0.99)] * 1e3:.2f} ms  overruns {self.overruns}  dropped ticks {self.dropped_ticks}",
+            f"  per match mean {mean_us:.1f} us/tick"
+            + (f"  worst #{max_match.id} {max_match.cpu_ns / max(1, max_match.ticks) / 1e3:.1f} us" if max_match and max_match.ticks else ""),
+        ]
+        if mean_us:
+            lines.append(f"  ~{int(budget_us / mean_us)} matches per core at {self.tick_rate} Hz")
+        return "\n".join(lines)
+
+
+async def _report_every(server: MatchServer, seconds: float) -> None:
+    while True:
+        await asyncio.sleep(seconds)
+        print(server.report(), flush=True)
+
+
+async def bot_client(host: str, port: int, level: int, rng: random.Random) -> None:
+    """Minimal remote player for load tests: joins, then sends random inputs a few times a second."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(JOIN.pack(b"J", level))
+    try:
+        await reader.readexactly(WELCOME.size)
+        drain = asyncio.ensure_future(_drain_states(reader))
+        while not drain.done():
+            writer.write(INPUT.pack(b"I", rng.randrange(8)))
+            await asyncio.sleep(rng.uniform(0.05, 0.3))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _drain_states(reader: asyncio.StreamReader) -> None:
+    try:
+        while True:
+            await reader.readexactly(STATE.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+
+async def serve(host: str, port: int, tick_rate: int, send_every: int, bots: int, report_s: float) -> None:
+    server = MatchServer(tick_rate, send_every)
+    server.add_bots(bots)
+    listener = await asyncio.start_server(server.handle_client, host, port)
+    print(f"serving on {host}:{port} at {tick_rate} Hz", flush=True)
+    async with listener:
+        await asyncio.gather(server.run(), _report_every(server, report_s))
+
+
+async def run_clients(host: str, port: int, count: int, level: int) -> None:
+    rng = random.Random()
+    await asyncio.gather(*(bot_client(host, port, level, random.Random(rng.random())) for _ in range(count)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pong match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=cfg.SERVER_PORT)
+    parser.add_argument("--tick-rate", type=int, default=cfg.TICK_RATE)
+    parser.add_argument("--send-every", type=int, default=1, help="send state every N ticks (events are always sent)")
+    parser.add_argument("--bots", type=int, default=0, help="in-process AI-vs-AI matches to add as load")
+    parser.add_argument("--report", type=float, default=5.0, help="seconds between stats reports")
+    parser.add_argument("--clients", type=int, default=0, help="instead of serving, connect N bot clients to --host/--port")
+    parser.add_argument("--level", type=int, default=2, help="AI level the bot clients play against, 1-based in AI_LEVELS order (0 = pair them up)")
+    args = parser.parse_args(argv)
+    try:
+        if args.clients:
+            asyncio.run(run_clients(args.host, args.port, args.clients, args.level))
+        else:
+            asyncio.run(serve(args.host, args.port, args.tick_rate, args.send_every, args.bots, args.report))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Wall-clock breakdown of startup phases up to the first presented frame.
+
+    When disabled, phase() still works as a context manager but records nothing.
+    """
+
+    def __init__(self, enabled: bool = False, start: float | None = None) -> None:
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.phases: list[tuple[str, float]] = []
+        self.first_frame_s: float | None = None
+
+    def record(self, name: str, secs: float) -> None:
+        if self.enabled:
+            self.phases.append((name, secs))
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - t0))
+
+    def first_frame(self) -> None:
+        """Record time-to-first-frame and print the report (once)."""
+        if not self.enabled or self.first_frame_s is not None:
+            return
+        self.first_frame_s = time.perf_counter() - self.start
+        print(self.report(), file=sys.stderr)
+
+    def report(self) -> str:
+        lines = ["startup profile:"]
+        for name, secs in self.phases:
+            lines.append(f"  {name:24s} {secs * 1000:8.2f} ms")
+        accounted = sum(secs for _, secs in self.phases)
+        if self.first_frame_s is not None:
+            lines.append(f"  {'other':24s} {(self.first_frame_s - accounted) * 1000:8.2f} ms")
+            lines.append(f"  {'time to first frame':24s} {self.first_frame_s * 1000:8.2f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+import pygame
+
+import config as cfg
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Entries are keyed by (font, text, color, antialias). Returned surfaces are
+    shared between callers and must not be drawn on.
+    """
+
+    def __init__(self, max_entries: int = cfg.TEXT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+    """Drop-in for font.render(text, antialias, color) backed by the shared cache."""
+    return _cache.render(font, text, antialias, color)
+
+
+def text_cache() -> TextCache:
+    return _cache
@@ -0,0 +1,213 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, replace
+from typing import Dict, Optional
+
+import config as cfg
+from ai import AIProfile, PROFILES, load_profiles
+from engine import GameState
+
+
+RALLY_BINS = 100  # rallies of RALLY_BINS - 1 hits or more share the last bin
+
+
+def play_match(left_ai: str, right_ai: str, seed: int, profiles: Dict[str, AIProfile], max_ticks: int) -> tuple[Optional[str], int, list[int]]:
+    """Play one headless match; returns (winner or None on timeout, ticks, paddle hits per point)."""
+    state = GameState(left_ai=left_ai, right_ai=right_ai, seed=seed, profiles=profiles)
+    dt_ms = 1000.0 / cfg.TICK_RATE
+    step = state.step
+    events = state.events
+    rallies = []
+    hits = 0
+    while state.winner is None and state.tick < max_ticks:
+        step(0, dt_ms)
+        if events:
+            hits += events.count("hit")
+            if "score" in events:
+                rallies.append(hits)
+                hits = 0
+    return state.winner, state.tick, rallies
+
+
+def _new_stats() -> dict:
+    return {"matches": 0, "left_wins": 0, "right_wins": 0, "timeouts": 0, "ticks": 0, "points": 0,
+            "rally_hist": [0] * RALLY_BINS}
+
+
+def play_batch(left_ai: str, right_ai: str, seeds: range, profiles: Dict[str, AIProfile], max_ticks: int) -> tuple[str, str, dict]:
+    """Worker task: play one match per seed and return the pairing's aggregate."""
+    stats = _new_stats()
+    for seed in seeds:
+        winner, ticks, rallies = play_match(left_ai, right_ai, seed, profiles, max_ticks)
+        stats["matches"] += 1
+        stats["ticks"] += ticks
+        stats["points"] += len(rallies)
+        if winner == 'left':
+            stats["left_wins"] += 1
+        elif winner == 'right':
+            stats["right_wins"] += 1
+        else:
+            stats["timeouts"] += 1
+        hist = stats["rally_hist"]
+        for hits in rallies:
+            hist[min(hits, RALLY_BINS - 1)] += 1
+    return left_ai, right_ai, stats
+
+
+def _merge(into: dict, stats: dict) -> None:
+    for key, value in stats.items():
+        if key == "rally_hist":
+            into[key] = [a + b for a, b in zip(into[key], value)]
+        else:
+            into[key] += value
+
+
+def _rally_mean(hist: list[int]) -> float:
+    total = sum(hist)
+    return sum(i * n for i, n in enumerate(hist)) / total if total else 0.0
+
+
+def _rally_percentile(hist: list[int], q: float) -> int:
+    target = q * sum(hist)
+    seen = 0
+    for i, n in enumerate(hist):
+        seen += n
+        if n and seen >= target:
+            return i
+    return 0
+
+
+def summarize(pairings: dict, profiles: Dict[str, AIProfile], elapsed_s: float) -> dict:
+    """Per-pairing and per-level figures derived from the raw counters."""
+    rows = []
+    levels = {level: {"wins": 0, "decided": 0} for level in profiles}
+    for (left, right), s in pairings.items():
+        decided = s["left_wins"] + s["right_wins"]
+        minutes = s["ticks"] / cfg.TICK_RATE / 60
+        rows.append({
+            "left": left, "right": right, "matches": s["matches"],
+            "left_win_rate": s["left_wins"] / decided if decided else None,
+            "timeouts": s["timeouts"],
+            "points_per_minute": s["points"] / minutes if minutes else 0.0,
+            "rally_mean": _rally_mean(s["rally_hist"]),
+            "rally_p50": _rally_percentile(s["rally_hist"], 0.5),
+            "rally_p90": _rally_percentile(s["rally_hist"], 0.9),
+            "rally_hist": s["rally_hist"],
+        })
+        levels[left]["wins"] += s["left_wins"]
+        levels[right]["wins"] += s["right_wins"]
+        levels[left]["decided"] += decided
+        levels[right]["decided"] += decided
+    total_ticks = sum(s["ticks"] for s in pairings.values())
+    return {
+        "profiles": {name: asdict(profile) for name, profile in profiles.items()},
+        "tick_rate": cfg.TICK_RATE,
+        "elapsed_s": elapsed_s,
+        "matches": sum(s["matches"] for s in pairings.values()),
+        "simulated_minutes": total_ticks / cfg.TICK_RATE / 60,
+        "pairings": rows,
+        "levels": {level: (v["wins"] / v["decided"] if v["decided"] else None) for level, v in levels.items()},
+    }
+
+
+def format_report(summary: dict) -> str:
+    # Level columns fit the longest level name plus a gap
+    col = max([len("right")] + [len(name) for name in summary["profiles"]]) + 2
+    lines = [
+        f"{summary['matches']} matches, {summary['simulated_minutes']:.0f} simulated minutes in {summary['elapsed_s']:.1f}s",
+        "speed factors: " + ", ".join(f"{k}={v['speed_factor']:g}" for k, v in summary["profiles"].items()),
+        "",
+        f"{'left':<{col}}{'right':<{col}}{'matches':>8}{'left win':>10}{'timeouts':>10}{'pts/min':>9}{'rally avg':>11}{'p50':>5}{'p90':>5}",
+    ]
+    for row in summary["pairings"]:
+        rate = f"{row['left_win_rate']:.1%}" if row["left_win_rate"] is not None else "-"
+        lines.append(f"{row['left']:<{col}}{row['right']:<{col}}{row['matches']:>8}{rate:>10}{row['timeouts']:>10}"
+                     f"{row['points_per_minute']:>9.1f}{row['rally_mean']:>11.2f}{row['rally_p50']:>5}{row['rally_p90']:>5}")
+    lines.append("")
+    lines.append("overall win rate: " + ", ".join(
+        f"{level} {rate:.1%}" if rate is not None else f"{level} -" for level, rate in summary["levels"].items()))
+    return "\n".join(lines)
+
+
+def run_tournament(matches_per_pairing: int, seed: int = 0, profiles: Dict[str, AIProfile] = PROFILES,
+                   workers: Optional[int] = None, chunk: int = 25, max_ticks: int = 48000,
+                   progress_s: float = 2.0) -> dict:
+    """Round-robin of every ordered pairing of profiles (so side bias cancels), spread over a process pool.
+
+    Seeds are assigned per pairing independently of the worker count, so a
+    rerun with the same arguments gives the same results.
+    """
+    pairings = {pair: _new_stats() for pair in itertools.product(profiles, repeat=2)}
+    start = time.perf_counter()
+    last_print = start
+    done = 0
+    total = matches_per_pairing * len(pairings)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for index, (left, right) in enumerate(pairings):
+            base = (seed * 1_000_003 + index) * 1_000_003
+            for first in range(0, matches_per_pairing, chunk):
+                seeds = range(base + first, base + min(first + chunk, matches_per_pairing))
+                futures.append(pool.submit(play_batch, left, right, seeds, profiles, max_ticks))
+        for future in as_completed(futures):
+            left, right, stats = future.result()
+            _merge(pairings[(left, right)], stats)
+            done += stats["matches"]
+            now = time.perf_counter()
+            if progress_s and (now - last_print >= progress_s or done == total):
+                last_print = now
+                print(_progress_line(pairings, done, total, now - start), file=sys.stderr, flush=True)
+    return summarize(pairings, profiles, time.perf_counter() - start)
+
+
+def _progress_line(pairings: dict, done: int, total: int, elapsed: float) -> str:
+    parts = []
+    for (left, right), s in pairings.items():
+        decided = s["left_wins"] + s["right_wins"]
+        if decided:
+            parts.append(f"{left[0]}v{right[0]} {s['left_wins'] / decided:.0%}")
+    return f"[{done}/{total} {done / max(elapsed, 1e-9):.0f} matches/s] " + " ".join(parts)
+
+
+def _parse_factors(text: str) -> Dict[str, float]:
+    factors = {}
+    for item in filter(None, text.split(",")):
+        level, _, value = item.partition("=")
+        factors[level] = float(value)
+    return factors
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Round-robin AI tournament for difficulty calibration")
+    parser.add_argument("--matches", type=int, default=200, help="matches per ordered pairing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk", type=int, default=25, help="matches per worker task")
+    parser.add_argument("--max-ticks", type=int, default=48000, help="frames before a match is called a timeout")
+    parser.add_argument("--ai-profiles", metavar="FILE", help="AI profile table to play instead of the configured one")
+    parser.add_argument("--factors", type=_parse_factors, default={},
+                        help="override speed factors, e.g. Easy=0.5,Hard=1.2")
+    parser.add_argument("--out", default="tournament.json", help="write the full summary as JSON here")
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.ai_profiles) if args.ai_profiles else dict(PROFILES)
+    for level, factor in args.factors.items():
+        if level not in profiles:
+            parser.error(f"unknown level {level!r}")
+        profiles[level] = replace(profiles[level], speed_factor=factor)
+    summary = run_tournament(args.matches, args.seed, profiles, workers=args.workers,
+                             chunk=args.chunk, max_ticks=args.max_ticks)
+    print(format_report(summary))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+        print(f"summary written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
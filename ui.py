@@ -1,42 +1,384 @@
 import sys
+import time
 import pygame
+import assets
 import config as cfg
+from pacing import PACE_VSYNC
+import screen
+from textcache import render_text, text_cache
 
 
-def draw(window: pygame.Surface, left_paddle, right_paddle, ball, left_score: int, right_score: int, left_name: str, right_name: str, font: pygame.font.Font) -> None:
-    window.fill(cfg.BLACK)
+DASH_HEIGHT = 15
+DASH_GAP = 12
+TITLE_BUTTON_AREA = 180  # canvas height kept below the title image for the menu buttons (full-size canvas)
 
+
+# Static background keyed by (size, world scale, background color, line color)
+_playfield_cache = {"key": None, "surface": None}
+
+
+def _draw_center_line(window: pygame.Surface) -> None:
     width, height = window.get_size()
-    dash_height = 15
-    gap = 12
     x = width // 2
-    for y in range(0, height, dash_height + gap):
-        pygame.draw.rect(window, cfg.WHITE, pygame.Rect(x - 2, y, 4, dash_height))
+    dash, gap, line = screen.scaled(DASH_HEIGHT), screen.scaled(DASH_GAP), screen.scaled(4)
+    for y in range(0, height, dash + gap):
+        pygame.draw.rect(window, cfg.WHITE, pygame.Rect(x - line // 2, y, line, dash))
+
+
+def get_playfield(window: pygame.Surface) -> pygame.Surface:
+    """Background with the dashed center line, rebuilt only when the window size,
+    the render scale or the theme colors in config change."""
+    key = (window.get_size(), screen.world_scale(), cfg.BLACK, cfg.WHITE)
+    if _playfield_cache["key"] != key:
+        surface = pygame.Surface(window.get_size())
+        surface.fill(cfg.BLACK)
+        _draw_center_line(surface)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _playfield_cache["key"] = key
+        _playfield_cache["surface"] = surface
+    return _playfield_cache["surface"]
+
+
+def invalidate_playfield() -> None:
+    _playfield_cache["key"] = None
+    _playfield_cache["surface"] = None
+
+
+# Interpolated paddle rects, reused every frame
+_lerp_rects = (pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+
+
+def _paddle_rect(out: pygame.Rect, paddle, y: float, scale: float) -> pygame.Rect:
+    out.update(round(paddle.x * scale), round(y * scale), max(1, round(paddle.width * scale)), max(1, round(paddle.height * scale)))
+    return out
+
+
+def _entity_shapes(left_paddle, right_paddle, ball, prev, alpha: float):
+    """Paddle rects and ball center on the canvas, interpolated toward the
+    current state when prev is given.
+
+    The rects are shared and overwritten by the next call.
+    """
+    scale = screen.world_scale()
+    if prev is None:
+        if scale == 1.0:
+            return left_paddle.rect, right_paddle.rect, (int(ball.x), int(ball.y))
+        left_y, right_y, ball_x, ball_y = left_paddle.y, right_paddle.y, ball.x, ball.y
+    else:
+        pbx, pby, ply, pry = prev
+        left_y = ply + (left_paddle.y - ply) * alpha
+        right_y = pry + (right_paddle.y - pry) * alpha
+        ball_x = pbx + (ball.x - pbx) * alpha
+        ball_y = pby + (ball.y - pby) * alpha
+    left_rect = _paddle_rect(_lerp_rects[0], left_paddle, left_y, scale)
+    right_rect = _paddle_rect(_lerp_rects[1], right_paddle, right_y, scale)
+    return left_rect, right_rect, (int(ball_x * scale), int(ball_y * scale))
+
+
+# Pre-rendered ball sprites keyed by (radius, color)
+_ball_sprites: dict = {}
+_SPRITE_KEY = (255, 0, 255)
+
+
+def _ball_sprite(radius: int) -> pygame.Surface:
+    key = (radius, cfg.WHITE)
+    sprite = _ball_sprites.get(key)
+    if sprite is None:
+        size = 2 * radius + 1
+        sprite = pygame.Surface((size, size))
+        sprite.fill(_SPRITE_KEY)
+        pygame.draw.circle(sprite, cfg.WHITE, (radius, radius), radius)
+        sprite.set_colorkey(_SPRITE_KEY, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        _ball_sprites[key] = sprite
+    return sprite
+
 
-    pygame.draw.rect(window, cfg.WHITE, left_paddle.rect)
-    pygame.draw.rect(window, cfg.WHITE, right_paddle.rect)
+def draw_balls(window: pygame.Surface, xs: list[int], ys: list[int], radius: int) -> None:
+    """Draw many equal balls, given their sprites' top-left corners, in one blits() call."""
+    sprite = _ball_sprite(radius)
+    window.blits([(sprite, pos) for pos in zip(xs, ys)], doreturn=False)
 
-    pygame.draw.circle(window, cfg.WHITE, (int(ball.x), int(ball.y)), ball.radius)
+
+def _score_label_positions(width: int, left_text: pygame.Surface, right_text: pygame.Surface):
+    top = screen.scaled(12)
+    return ((width // 4 - left_text.get_width() // 2, top),
+            (width * 3 // 4 - right_text.get_width() // 2, top))
+
+
+def draw(window: pygame.Surface, left_paddle, right_paddle, ball, left_score: int, right_score: int, left_name: str, right_name: str, font: pygame.font.Font, prev=None, alpha: float = 1.0) -> None:
+    """Draw the playfield; with prev=(ball_x, ball_y, left_y, right_y) from the
+    previous tick, positions are interpolated by alpha toward the current state."""
+    window.blit(get_playfield(window), (0, 0))
+
+    width, height = window.get_size()
+
+    left_rect, right_rect, ball_pos = _entity_shapes(left_paddle, right_paddle, ball, prev, alpha)
+    pygame.draw.rect(window, cfg.WHITE, left_rect)
+    pygame.draw.rect(window, cfg.WHITE, right_rect)
+
+    pygame.draw.circle(window, cfg.WHITE, ball_pos, screen.scaled(ball.radius))
 
     left_label = f"{left_name} {left_score}"
     right_label = f"{right_name} {right_score}"
 
-    left_text = font.render(left_label, True, cfg.WHITE)
-    right_text = font.render(right_label, True, cfg.WHITE)
+    left_text = render_text(font, left_label, True, cfg.WHITE)
+    right_text = render_text(font, right_label, True, cfg.WHITE)
+
+    left_pos, right_pos = _score_label_positions(width, left_text, right_text)
+    window.blit(left_text, left_pos)
+    window.blit(right_text, right_pos)
+
+
+class ProfilerHUD:
+    """Overlay for a frameprof.FrameProfiler: per-phase avg/p99 and a frame-time graph.
+
+    The statistics are recomputed and their text rendered REFRESH_S apart;
+    other frames only blit the cached labels and redraw the graph.
+    """
+
+    REFRESH_S = 0.5
+    GRAPH_FRAMES = 240
+    GRAPH_HEIGHT = 60
+
+    def __init__(self, profiler, font: pygame.font.Font, budget_ms: float) -> None:
+        self.profiler = profiler
+        self.font = font
+        self.budget_ms = budget_ms
+        self._labels: list[pygame.Surface] = []
+        self._next_refresh = 0.0
+
+    def _refresh(self) -> None:
+        # Rendered directly: these strings change constantly and would only churn textcache
+        render = self.font.render
+        self._labels = [render(f"{'phase':9s}{'avg ms':>8s}{'p99 ms':>8s}", True, cfg.WHITE)]
+        for name, mean, p99 in self.profiler.stats():
+            self._labels.append(render(f"{name:9s}{mean:8.2f}{p99:8.2f}", True, cfg.WHITE))
+        text = text_cache().stats()
+        self._labels.append(render(f"text cache {text['entries']} entries, {text['hit_rate']:.1%} hits ({text['misses']} misses)", True, cfg.WHITE))
+
+    def draw(self, window: pygame.Surface) -> None:
+        now = time.perf_counter()
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.REFRESH_S
+            self._refresh()
+        line_h = self.font.get_linesize()
+        width = max([label.get_width() for label in self._labels] + [self.GRAPH_FRAMES]) + 16
+        height = len(self._labels) * line_h + self.GRAPH_HEIGHT + 24
+        box = pygame.Rect(8, window.get_height() - height - 8, width, height)
+        pygame.draw.rect(window, (20, 20, 20), box)
+        pygame.draw.rect(window, cfg.WHITE, box, 1)
+        y = box.y + 8
+        for label in self._labels:
+            window.blit(label, (box.x + 8, y))
+            y += line_h
+
+        # Frame times, scaled so the budget line sits at half height
+        graph = pygame.Rect(box.x + 8, y + 8, self.GRAPH_FRAMES, self.GRAPH_HEIGHT)
+        scale = graph.height / (2 * self.budget_ms)
+        budget_y = graph.bottom - round(self.budget_ms * scale)
+        pygame.draw.line(window, (90, 90, 90), (graph.left, budget_y), (graph.right, budget_y))
+        times = self.profiler.frame_times(self.GRAPH_FRAMES)
+        if len(times) > 1:
+            points = [(graph.left + i, graph.bottom - min(graph.height, round(ms * scale))) for i, ms in enumerate(times)]
+            pygame.draw.lines(window, cfg.WHITE, False, points)
+
 
-    window.blit(left_text, (width // 4 - left_text.get_width() // 2, 12))
-    window.blit(right_text, (width * 3 // 4 - right_text.get_width() // 2, 12))
+class PacingHUD:
+    """Overlay for a pacing.FramePacer: mode, interval percentiles and jitter,
+    and the interval histogram around the target period.
+
+    Labels are re-rendered REFRESH_S apart, like ProfilerHUD.
+    """
+
+    REFRESH_S = 0.5
+    BAR_WIDTH = 3
+    GRAPH_HEIGHT = 60
+
+    def __init__(self, pacer, font: pygame.font.Font) -> None:
+        self.pacer = pacer
+        self.font = font
+        self._labels: list[pygame.Surface] = []
+        self._span_ms = 0.0
+        self._next_refresh = 0.0
+
+    def _refresh(self) -> None:
+        render = self.font.render
+        pacer = self.pacer
+        target = f"{pacer.fps} fps" if pacer.target_ms else "display rate" if pacer.mode == PACE_VSYNC else "no cap"
+        self._labels = [render(f"pacing {pacer.mode} ({target})", True, cfg.WHITE)]
+        s = pacer.stats.summary()
+        if s:
+            self._labels.append(render(f"p50 {s['p50']:.2f}  p90 {s['p90']:.2f}  p99 {s['p99']:.2f}", True, cfg.WHITE))
+            self._labels.append(render(f"p99.9 {s['p99.9']:.2f}  max {s['max']:.2f}  sd {s['sd']:.2f} ms", True, cfg.WHITE))
+        # Histogram from 0 to three target periods (three medians when nothing
+        # sets a target); longer frames pile up in the rightmost bar
+        self._span_ms = 3 * (pacer.target_ms or (s["p50"] if s else 0.0)) or cfg.FRAME_TIME_MAX_MS
+
+    def draw(self, window: pygame.Surface) -> None:
+        now = time.perf_counter()
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.REFRESH_S
+            self._refresh()
+        stats = self.pacer.stats
+        nbins = max(1, min(stats.bins, int(self._span_ms / stats.bin_ms)))
+        counts = list(stats.counts[:nbins])
+        counts[-1] += sum(stats.counts[nbins:])
+
+        line_h = self.font.get_linesize()
+        graph_w = nbins * self.BAR_WIDTH
+        width = max([label.get_width() for label in self._labels] + [graph_w]) + 16
+        height = len(self._labels) * line_h + self.GRAPH_HEIGHT + 24
+        box = pygame.Rect(window.get_width() - width - 8, window.get_height() - height - 8, width, height)
+        pygame.draw.rect(window, (20, 20, 20), box)
+        pygame.draw.rect(window, cfg.WHITE, box, 1)
+        y = box.y + 8
+        for label in self._labels:
+            window.blit(label, (box.x + 8, y))
+            y += line_h
+
+        graph = pygame.Rect(box.x + 8, y + 8, graph_w, self.GRAPH_HEIGHT)
+        if self.pacer.target_ms:
+            target_x = graph.left + round(self.pacer.target_ms / stats.bin_ms * self.BAR_WIDTH)
+            pygame.draw.line(window, (90, 90, 90), (target_x, graph.top), (target_x, graph.bottom))
+        top = max(counts)
+        if top:
+            for i, c in enumerate(counts):
+                if c:
+                    h = max(1, round(graph.height * c / top))
+                    window.fill(cfg.WHITE, (graph.left + i * self.BAR_WIDTH, graph.bottom - h, self.BAR_WIDTH - 1, h))
+
+
+def draw_multiball(window: pygame.Surface, left_paddle, right_paddle, xs: list[int], ys: list[int], radius: int, left_score: int, right_score: int, left_name: str, right_name: str, font: pygame.font.Font) -> None:
+    """Playfield for multi-ball mode; xs/ys come from MultiBallState.ball_corners()
+    and radius is the sprite radius, both at the canvas scale."""
+    window.blit(get_playfield(window), (0, 0))
+    scale = screen.world_scale()
+    pygame.draw.rect(window, cfg.WHITE, _paddle_rect(_lerp_rects[0], left_paddle, left_paddle.y, scale))
+    pygame.draw.rect(window, cfg.WHITE, _paddle_rect(_lerp_rects[1], right_paddle, right_paddle.y, scale))
+    draw_balls(window, xs, ys, radius)
+
+    left_text = render_text(font, f"{left_name} {left_score}", True, cfg.WHITE)
+    right_text = render_text(font, f"{right_name} {right_score}", True, cfg.WHITE)
+    left_pos, right_pos = _score_label_positions(window.get_width(), left_text, right_text)
+    window.blit(left_text, left_pos)
+    window.blit(right_text, right_pos)
+
+
+class DirtyRenderer:
+    """Playfield renderer that only repaints what moved or changed.
+
+    draw() takes the same arguments as ui.draw() and returns the list of rects to
+    pass to screen.present(). Call invalidate() whenever something else
+    (menus, overlays) has drawn over the window; the next frame is then a full
+    redraw.
+    """
+
+    def __init__(self) -> None:
+        self._prev_rects: list[pygame.Rect] = []
+        # Sprite rects of this frame and the last one, alternated so neither is reallocated
+        self._rect_buffers = tuple([pygame.Rect(0, 0, 0, 0) for _ in range(3)] for _ in range(2))
+        self._buffer = 0
+        self._labels = None
+        self._label_surfaces = None
+        self._label_rects: list[pygame.Rect] = []
+        self._full = True
+
+    def invalidate(self) -> None:
+        self._full = True
+
+    def _restore_background(self, window: pygame.Surface, area: pygame.Rect) -> None:
+        window.blit(get_playfield(window), area, area)
+
+    def draw(self, window: pygame.Surface, left_paddle, right_paddle, ball, left_score: int, right_score: int, left_name: str, right_name: str, font: pygame.font.Font, prev=None, alpha: float = 1.0) -> list[pygame.Rect]:
+        width, height = window.get_size()
+        labels = (f"{left_name} {left_score}", f"{right_name} {right_score}")
+        labels_changed = labels != self._labels
+        if labels_changed:
+            self._labels = labels
+            self._label_surfaces = (render_text(font, labels[0], True, cfg.WHITE), render_text(font, labels[1], True, cfg.WHITE))
+        left_text, right_text = self._label_surfaces
+        left_pos, right_pos = _score_label_positions(width, left_text, right_text)
+        label_rects = [left_text.get_rect(topleft=left_pos), right_text.get_rect(topleft=right_pos)]
+
+        left_rect, right_rect, ball_pos = _entity_shapes(left_paddle, right_paddle, ball, prev, alpha)
+        r = screen.scaled(ball.radius)
+        sprite_rects = self._rect_buffers[self._buffer]
+        self._buffer ^= 1
+        sprite_rects[0].update(left_rect)
+        sprite_rects[1].update(right_rect)
+        sprite_rects[2].update(ball_pos[0] - r, ball_pos[1] - r, 2 * r + 1, 2 * r + 1)
+
+        if self._full:
+            window.blit(get_playfield(window), (0, 0))
+            dirty = [window.get_rect()]
+            redraw_labels = label_rects
+        else:
+            erase = self._prev_rects
+            if labels_changed:
+                # Old label may be wider than the new one
+                erase = erase + self._label_rects
+            for area in erase:
+                self._restore_background(window, area)
+            # Antialiased text blends with what is under it, so a label is only
+            # re-blitted over a freshly restored background
+            redraw_labels = [area for area in label_rects if labels_changed or area.collidelist(erase) != -1]
+            for area in redraw_labels:
+                self._restore_background(window, area)
+            dirty = erase + sprite_rects + redraw_labels
+
+        pygame.draw.rect(window, cfg.WHITE, left_rect)
+        pygame.draw.rect(window, cfg.WHITE, right_rect)
+        pygame.draw.circle(window, cfg.WHITE, ball_pos, r)
+        if label_rects[0] in redraw_labels:
+            window.blit(left_text, left_pos)
+        if label_rects[1] in redraw_labels:
+            window.blit(right_text, right_pos)
+
+        self._prev_rects = sprite_rects
+        self._label_rects = label_rects
+        self._full = False
+        return dirty
+
+
+def wait_events(block: bool = True, timeout_ms: int = cfg.IDLE_WAIT_MS) -> list:
+    """Return pending events. With block set and an empty queue, sleep in
+    pygame.event.wait() until input arrives or timeout_ms passes."""
+    events = pygame.event.get()
+    if events or not block:
+        return events
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def was_exposed(events: list) -> bool:
+    """True if the window contents may have been lost and need a full redraw."""
+    return any(event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.WINDOWSIZECHANGED) for event in events)
+
+
+def draw_banner(window: pygame.Surface, message: str, font: pygame.font.Font) -> None:
+    """Boxed one-line message centered on the window (netplay status, waiting screens)."""
+    label = render_text(font, message, True, cfg.WHITE)
+    box = pygame.Rect(0, 0, label.get_width() + 40, label.get_height() + 16)
+    box.center = (window.get_width() // 2, window.get_height() // 2)
+    pygame.draw.rect(window, (20, 20, 20), box)
+    pygame.draw.rect(window, cfg.WHITE, box, 2)
+    window.blit(label, (box.x + 20, box.y + 8))
 
 
 def draw_winner(window: pygame.Surface, message: str, large_font: pygame.font.Font, score_font: pygame.font.Font, selected: int, mouse_pos: tuple[int, int]):
     width, height = window.get_size()
-    text = large_font.render(message, True, cfg.WHITE)
+    text = render_text(large_font, message, True, cfg.WHITE)
     text_pos = (width // 2 - text.get_width() // 2, height // 2 - text.get_height() // 2 - 40)
     window.blit(text, text_pos)
 
     padding_x, padding_y = 22, 12
-    restart_label = score_font.render("Restart", True, cfg.BLACK)
-    menu_label = score_font.render("Back to Menu", True, cfg.BLACK)
+    restart_label = render_text(score_font, "Restart", True, cfg.BLACK)
+    menu_label = render_text(score_font, "Back to Menu", True, cfg.BLACK)
     restart_w = restart_label.get_width() + padding_x * 2
     restart_h = restart_label.get_height() + padding_y * 2
     menu_w = menu_label.get_width() + padding_x * 2
@@ -65,23 +407,25 @@ def draw_winner(window: pygame.Surface, message: str, large_font: pygame.font.Fo
     return restart_rect, menu_rect
 
 
-def show_main_menu(window: pygame.Surface, title_font: pygame.font.Font, ui_font: pygame.font.Font) -> str:
-    clock = pygame.time.Clock()
+def show_main_menu(window: pygame.Surface, title_font: pygame.font.Font, ui_font: pygame.font.Font, on_first_frame=None) -> str:
     selection = '1p'
-    title_image = None
-    try:
-        title_image = pygame.image.load(cfg.TITLE_IMAGE_PNG).convert_alpha()
-    except Exception:
-        try:
-            title_image = pygame.image.load(cfg.TITLE_IMAGE_JPG).convert()
-        except Exception:
-            title_image = None
+    last_view = None
+    title_name, alpha = cfg.TITLE_IMAGE_PNG, True
+    title_image = assets.load_image(title_name, alpha)
+    if title_image is None:
+        title_name, alpha = cfg.TITLE_IMAGE_JPG, False
+        title_image = assets.load_image(title_name, alpha)
+    if title_image:
+        # Shrink the image to leave room for the buttons on the canvas; the
+        # resized copy is cached and only rebuilt when the canvas size changes
+        width, height = window.get_size()
+        scale = min(1.0, width / title_image.get_width(), (height - screen.scaled(TITLE_BUTTON_AREA)) / title_image.get_height())
+        title_image = assets.load_image_scaled(title_name, scale, alpha)
     while True:
-        clock.tick(cfg.FPS)
-        mouse_pos = pygame.mouse.get_pos()
+        events = wait_events(block=last_view is not None)
         width, height = window.get_size()
-        btn1_label = ui_font.render("1 Player", True, cfg.BLACK)
-        btn2_label = ui_font.render("2 Players", True, cfg.BLACK)
+        btn1_label = render_text(ui_font, "1 Player", True, cfg.BLACK)
+        btn2_label = render_text(ui_font, "2 Players", True, cfg.BLACK)
         padding_x, padding_y = 26, 14
         b1w, b1h = btn1_label.get_width() + padding_x * 2, btn1_label.get_height() + padding_y * 2
         b2w, b2h = btn2_label.get_width() + padding_x * 2, btn2_label.get_height() + padding_y * 2
@@ -92,7 +436,7 @@ def show_main_menu(window: pygame.Surface, title_font: pygame.font.Font, ui_font
         start_x = width // 2 - total_w // 2
         one_rect = pygame.Rect(start_x, base_y, b1w, b1h)
         two_rect = pygame.Rect(start_x + b1w + spacing, base_y, b2w, b2h)
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             elif event.type == pygame.KEYDOWN:
@@ -103,22 +447,29 @@ def show_main_menu(window: pygame.Surface, title_font: pygame.font.Font, ui_font
                 elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
                     return selection
             elif event.type == pygame.MOUSEMOTION:
-                if one_rect.collidepoint(event.pos):
+                if one_rect.collidepoint(screen.to_canvas(event.pos)):
                     selection = '1p'
-                elif two_rect.collidepoint(event.pos):
+                elif two_rect.collidepoint(screen.to_canvas(event.pos)):
                     selection = '2p'
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if one_rect.collidepoint(event.pos):
+                if one_rect.collidepoint(screen.to_canvas(event.pos)):
                     return '1p'
-                if two_rect.collidepoint(event.pos):
+                if two_rect.collidepoint(screen.to_canvas(event.pos)):
                     return '2p'
 
+        # Redraw only when something visible changed
+        mouse_pos = screen.mouse_pos()
+        view = (selection, one_rect.collidepoint(mouse_pos), two_rect.collidepoint(mouse_pos), width, height)
+        if view == last_view and not was_exposed(events):
+            continue
+        last_view = view
+
         window.fill(cfg.BLACK)
         if title_image:
             img_w, img_h = title_image.get_size()
             window.blit(title_image, (width // 2 - img_w // 2, 0))
         else:
-            title = title_font.render("PONG by gyrø", True, cfg.WHITE)
+            title = render_text(title_font, "PONG by gyrø", True, cfg.WHITE)
             window.blit(title, (width // 2 - title.get_width() // 2, 40))
 
         def draw_btn(rect: pygame.Rect, label: pygame.Surface, active: bool) -> None:
@@ -129,46 +480,63 @@ def show_main_menu(window: pygame.Surface, title_font: pygame.font.Font, ui_font
 
         draw_btn(one_rect, btn1_label, selection == '1p' or one_rect.collidepoint(mouse_pos))
         draw_btn(two_rect, btn2_label, selection == '2p' or two_rect.collidepoint(mouse_pos))
-        pygame.display.flip()
+        screen.present()
+        if on_first_frame:
+            on_first_frame()
+            on_first_frame = None
+
+
+def level_index_for_key(key: int, count: int) -> int | None:
+    """Index selected by number keys 1-9 (main row or keypad), if within count."""
+    for first in (pygame.K_1, pygame.K_KP1):
+        if first <= key < first + min(count, 9):
+            return key - first
+    return None
 
 
 def screen_ai_difficulty(window: pygame.Surface, ui_font: pygame.font.Font, levels, initial: str = "Medium") -> str:
-    clock = pygame.time.Clock()
     idx = max(0, list(levels).index(initial) if initial in levels else 1)
+    last_view = None
     while True:
-        clock.tick(cfg.FPS)
+        events = wait_events(block=last_view is not None)
         width, height = window.get_size()
-        tab_w = 220
-        tab_h = 60
+        count = len(levels)
         spacing = 24
-        total_w = tab_w * 3 + spacing * 2
+        tab_w = min(220, (width - spacing * (count + 1)) // count)
+        tab_h = 60
+        total_w = tab_w * count + spacing * (count - 1)
         start_x = width // 2 - total_w // 2
         y = height // 2 - 20
-        tab_rects = [pygame.Rect(start_x + i * (tab_w + spacing), y, tab_w, tab_h) for i in range(3)]
-        mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        tab_rects = [pygame.Rect(start_x + i * (tab_w + spacing), y, tab_w, tab_h) for i in range(count)]
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             elif event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_1, pygame.K_KP1): idx = 0
-                elif event.key in (pygame.K_2, pygame.K_KP2): idx = 1
-                elif event.key in (pygame.K_3, pygame.K_KP3): idx = 2
-                elif event.key == pygame.K_LEFT: idx = (idx - 1) % 3
-                elif event.key == pygame.K_RIGHT: idx = (idx + 1) % 3
+                picked = level_index_for_key(event.key, count)
+                if picked is not None: idx = picked
+                elif event.key == pygame.K_LEFT: idx = (idx - 1) % count
+                elif event.key == pygame.K_RIGHT: idx = (idx + 1) % count
                 elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
                     return levels[idx]
             elif event.type == pygame.MOUSEMOTION:
                 for i, r in enumerate(tab_rects):
-                    if r.collidepoint(event.pos):
+                    if r.collidepoint(screen.to_canvas(event.pos)):
                         idx = i
                         break
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 for i, r in enumerate(tab_rects):
-                    if r.collidepoint(event.pos):
+                    if r.collidepoint(screen.to_canvas(event.pos)):
                         return levels[i]
 
+        mouse_pos = screen.mouse_pos()
+        hovered = next((i for i, r in enumerate(tab_rects) if r.collidepoint(mouse_pos)), -1)
+        view = (idx, hovered, width, height)
+        if view == last_view and not was_exposed(events):
+            continue
+        last_view = view
+
         window.fill(cfg.BLACK)
-        title = ui_font.render("Select AI Difficulty", True, cfg.WHITE)
+        title = render_text(ui_font, "Select AI Difficulty", True, cfg.WHITE)
         window.blit(title, (width // 2 - title.get_width() // 2, height // 2 - 120))
         for i, lvl in enumerate(levels):
             rect = tab_rects[i]
@@ -176,18 +544,18 @@ def screen_ai_difficulty(window: pygame.Surface, ui_font: pygame.font.Font, leve
             bg = (200, 200, 200) if active else (60, 60, 60)
             pygame.draw.rect(window, bg, rect, border_radius=8)
             pygame.draw.rect(window, cfg.WHITE, rect, 2, border_radius=8)
-            label = ui_font.render(lvl, True, cfg.BLACK)
+            label = render_text(ui_font, lvl, True, cfg.BLACK)
             window.blit(label, (rect.x + (rect.w - label.get_width()) // 2, rect.y + (rect.h - label.get_height()) // 2))
         # Removed on-screen hint as requested
-        pygame.display.flip()
+        screen.present()
 
 
 def prompt_for_name(window: pygame.Surface, prompt_label: str, initial_value: str, font: pygame.font.Font) -> str:
     buffer = initial_value
-    clock = pygame.time.Clock()
+    last_view = None
     while True:
-        clock.tick(cfg.FPS)
-        for event in pygame.event.get():
+        events = wait_events(block=last_view is not None)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             elif event.type == pygame.KEYDOWN:
@@ -200,9 +568,13 @@ def prompt_for_name(window: pygame.Surface, prompt_label: str, initial_value: st
                 else:
                     if event.unicode and event.unicode.isprintable() and len(buffer) < 16:
                         buffer += event.unicode
+        view = (buffer, window.get_size())
+        if view == last_view and not was_exposed(events):
+            continue
+        last_view = view
         window.fill(cfg.BLACK)
-        title = font.render(prompt_label, True, cfg.WHITE)
-        name = font.render(buffer, True, cfg.WHITE)
+        title = render_text(font, prompt_label, True, cfg.WHITE)
+        name = render_text(font, buffer, True, cfg.WHITE)
         box_w = max(title.get_width(), name.get_width()) + 40
         box_h = title.get_height() + name.get_height() + 30
         box = pygame.Rect(0, 0, box_w, box_h)
@@ -212,6 +584,6 @@ def prompt_for_name(window: pygame.Surface, prompt_label: str, initial_value: st
         pygame.draw.rect(window, cfg.WHITE, box, 2)
         window.blit(title, (box.x + (box_w - title.get_width()) // 2, box.y + 8))
         window.blit(name, (box.x + (box_w - name.get_width()) // 2, box.y + 12 + title.get_height()))
-        pygame.display.flip()
+        screen.present()
 
 